@@ -14,13 +14,23 @@ bl_info = {
 
 import bpy
 from . import panel, operators
-from .operators import tree_operators, bush_operators
+from .operators import tree_operators, bush_operators, impostor_operators, skeleton_operators, proxy_operators, export_operators, fingerprint_operators, tile_operators, leaf_card_operators, bake_operators, merge_operators, gallery_operators
 
 classes = []
 classes += panel.classes
 classes += operators.classes
 classes += tree_operators.classes
 classes += bush_operators.classes
+classes += impostor_operators.classes
+classes += skeleton_operators.classes
+classes += proxy_operators.classes
+classes += export_operators.classes
+classes += fingerprint_operators.classes
+classes += tile_operators.classes
+classes += leaf_card_operators.classes
+classes += bake_operators.classes
+classes += merge_operators.classes
+classes += gallery_operators.classes
 
 def register():
     # Global type selection
@@ -293,15 +303,240 @@ def register():
         min=0
     )
     
+    # ===== IMPOSTOR PROPERTIES =====
+    bpy.types.Scene.impostor_grid = bpy.props.IntProperty(
+        name="Views",
+        description="Number of hemi-octahedral views per atlas side",
+        default=8,
+        min=2,
+        max=16
+    )
+    bpy.types.Scene.impostor_resolution = bpy.props.IntProperty(
+        name="View Resolution",
+        description="Resolution in pixels of each view in the atlas",
+        default=256,
+        min=32,
+        max=1024
+    )
+    bpy.types.Scene.impostor_samples = bpy.props.IntProperty(
+        name="Samples",
+        description="Cycles samples per impostor view",
+        default=16,
+        min=1,
+        max=256
+    )
+    bpy.types.Scene.impostor_distance = bpy.props.FloatProperty(
+        name="Impostor Distance",
+        description="Plants farther than this from the camera are replaced by their impostor cards",
+        default=50.0,
+        min=0.0,
+        unit='LENGTH'
+    )
+    
+    # ===== COLLISION PROXY PROPERTIES =====
+    bpy.types.Scene.proxy_branch_shape = bpy.props.EnumProperty(
+        name="Branch Shape",
+        description="Collision shape used for the trunk and first-level branches",
+        items=[
+            ('CAPSULE', "Capsules", "One capsule per branch segment"),
+            ('HULL', "Convex Hulls", "One convex hull per branch segment"),
+        ],
+        default='CAPSULE'
+    )
+    bpy.types.Scene.proxy_segments = bpy.props.IntProperty(
+        name="Segments per Branch",
+        description="Number of collision pieces each branch is split into",
+        default=2,
+        min=1,
+        max=8
+    )
+    bpy.types.Scene.proxy_foliage_volumes = bpy.props.IntProperty(
+        name="Foliage Volumes",
+        description="Number of convex volumes around the foliage (0 for none)",
+        default=4,
+        min=0,
+        max=16
+    )
+    bpy.types.Scene.proxy_foliage_margin = bpy.props.FloatProperty(
+        name="Foliage Margin",
+        description="How far foliage volumes extend past the branch tips",
+        default=0.3,
+        min=0.0,
+        max=5.0,
+        unit='LENGTH'
+    )
+    
+    # ===== TILE STREAMING PROPERTIES =====
+    bpy.types.Scene.tile_size = bpy.props.FloatProperty(
+        name="Tile Size",
+        description="Edge length of the grid tiles plants are sorted into",
+        default=50.0,
+        min=1.0,
+        unit='LENGTH'
+    )
+    bpy.types.Scene.tile_radius = bpy.props.FloatProperty(
+        name="Tile Radius",
+        description="Tiles farther than this from the camera or viewport are disabled",
+        default=150.0,
+        min=0.0,
+        unit='LENGTH',
+        update=tile_operators.refresh_streaming
+    )
+    bpy.types.Scene.tile_mode = bpy.props.EnumProperty(
+        name="Far Tiles",
+        description="What happens to tiles outside the radius",
+        items=[
+            ('EXCLUDE', "Exclude", "Exclude far tiles from the view layer so they are not evaluated"),
+            ('BOUNDS', "Bounds", "Display far tiles as bounding boxes"),
+        ],
+        default='EXCLUDE',
+        update=tile_operators.refresh_streaming
+    )
+    bpy.types.Scene.tile_streaming = bpy.props.BoolProperty(
+        name="Stream Tiles",
+        description="Keep updating the tiles as the camera or viewport moves",
+        default=False,
+        update=tile_operators.toggle_streaming
+    )
+    
+    # ===== LEAF CARD PROPERTIES =====
+    bpy.types.Scene.leaf_card_leaves = bpy.props.IntProperty(
+        name="Leaves per Card",
+        description="Maximum number of leaves grouped into one cluster card",
+        default=24,
+        min=2,
+        max=256
+    )
+    bpy.types.Scene.leaf_card_crossed = bpy.props.BoolProperty(
+        name="Crossed Cards",
+        description="Use two crossed cards per cluster so it reads from every side",
+        default=True
+    )
+    bpy.types.Scene.leaf_card_silhouette = bpy.props.FloatProperty(
+        name="Silhouette",
+        description="Size of the cards relative to the extent of their leaf cluster",
+        default=1.0,
+        min=0.25,
+        max=2.0
+    )
+    bpy.types.Scene.leaf_card_density = bpy.props.FloatProperty(
+        name="Density",
+        description="How densely leaves are packed into the baked card textures",
+        default=1.0,
+        min=0.2,
+        max=3.0
+    )
+    bpy.types.Scene.leaf_card_resolution = bpy.props.IntProperty(
+        name="Texture Size",
+        description="Resolution of the baked card textures",
+        default=512,
+        min=64,
+        max=2048
+    )
+    
+    # ===== BAKE PROPERTIES =====
+    bpy.types.Scene.bake_attribute_policy = bpy.props.EnumProperty(
+        name="Attributes",
+        description="What to do with the attributes of baked plant meshes",
+        items=[
+            ('KEEP', "Keep All", "Keep every attribute at full precision"),
+            ('STRIP', "Strip Unused", "Drop attributes no material or exporter reads"),
+            ('COMPACT', "Strip & Compact", "Drop unused attributes and store the rest in smaller types where it is safe"),
+        ],
+        default='COMPACT'
+    )
+    bpy.types.Scene.bake_keep_attributes = bpy.props.StringProperty(
+        name="Keep",
+        description="Comma-separated attribute name patterns to keep for export (wildcards allowed)",
+        default="UV*, season*, wind*"
+    )
+    
+    # ===== SEED GALLERY PROPERTIES =====
+    bpy.types.Scene.gallery_seed_start = bpy.props.IntProperty(
+        name="First Seed",
+        description="First seed rendered in the seed gallery",
+        default=0,
+        min=0
+    )
+    bpy.types.Scene.gallery_count = bpy.props.IntProperty(
+        name="Seeds",
+        description="Number of seeds rendered in the seed gallery",
+        default=8,
+        min=1,
+        max=64
+    )
+    bpy.types.Scene.gallery_workers = bpy.props.IntProperty(
+        name="Workers",
+        description="Number of background Blender processes rendering thumbnails in parallel",
+        default=2,
+        min=1,
+        max=16
+    )
+    bpy.types.Scene.gallery_samples = bpy.props.IntProperty(
+        name="Samples",
+        description="Cycles samples per thumbnail",
+        default=8,
+        min=1,
+        max=128
+    )
+    bpy.types.Scene.gallery_size = bpy.props.IntProperty(
+        name="Thumbnail Size",
+        description="Resolution of the gallery thumbnails",
+        default=128,
+        min=64,
+        max=512
+    )
     
     for cls in classes:
         bpy.utils.register_class(cls)
+    
+    bpy.app.handlers.load_post.append(tile_operators.resume_streaming)
 
 def unregister():
+    bpy.app.handlers.load_post.remove(tile_operators.resume_streaming)
+    tile_operators.stop_streaming()
+    gallery_operators.free_previews()
+    
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     
     # Remove custom properties
+    # Seed gallery properties
+    del bpy.types.Scene.gallery_size
+    del bpy.types.Scene.gallery_samples
+    del bpy.types.Scene.gallery_workers
+    del bpy.types.Scene.gallery_count
+    del bpy.types.Scene.gallery_seed_start
+    
+    # Bake properties
+    del bpy.types.Scene.bake_keep_attributes
+    del bpy.types.Scene.bake_attribute_policy
+    
+    # Leaf card properties
+    del bpy.types.Scene.leaf_card_resolution
+    del bpy.types.Scene.leaf_card_density
+    del bpy.types.Scene.leaf_card_silhouette
+    del bpy.types.Scene.leaf_card_crossed
+    del bpy.types.Scene.leaf_card_leaves
+    
+    # Tile streaming properties
+    del bpy.types.Scene.tile_streaming
+    del bpy.types.Scene.tile_mode
+    del bpy.types.Scene.tile_radius
+    del bpy.types.Scene.tile_size
+    
+    # Collision proxy properties
+    del bpy.types.Scene.proxy_foliage_margin
+    del bpy.types.Scene.proxy_foliage_volumes
+    del bpy.types.Scene.proxy_segments
+    del bpy.types.Scene.proxy_branch_shape
+    
+    # Impostor properties
+    del bpy.types.Scene.impostor_distance
+    del bpy.types.Scene.impostor_samples
+    del bpy.types.Scene.impostor_resolution
+    del bpy.types.Scene.impostor_grid
+    
     # Bush properties
     del bpy.types.Scene.bush_seed
     del bpy.types.Scene.bush_custom_season_value
@@ -1,4 +1,13 @@
 import os
+import hashlib
+import subprocess
+
+import bpy
+
+
+GENERATOR_NAME = "Simple Tree Generator"
+
+ADDON_PACKAGE = __package__.rpartition(".")[0]
 
 
 def get_addon_filepath():
@@ -8,5 +17,117 @@ def get_addon_filepath():
     return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
-classes = []
+def load_generator():
+    """
+    Returns the Rooted node group, appending it from the bundled assets if
+    the file does not have it yet. Returns None if it cannot be loaded.
+    """
+    node_group = bpy.data.node_groups.get(GENERATOR_NAME)
+    if node_group is not None:
+        return node_group
+    filepath = os.path.join(get_addon_filepath(), "assets", "assets.blend")
+    if not os.path.exists(filepath):
+        return None
+    with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
+        if GENERATOR_NAME in data_from.node_groups:
+            data_to.node_groups.append(GENERATOR_NAME)
+    return bpy.data.node_groups.get(GENERATOR_NAME)
+
 
+def get_generator_modifier(obj):
+    """
+    Returns the Rooted Geometry Nodes modifier of an object, or None.
+    """
+    node_group = bpy.data.node_groups.get(GENERATOR_NAME)
+    if node_group is None:
+        return None
+    for mod in obj.modifiers:
+        if mod.type == 'NODES' and mod.node_group == node_group:
+            return mod
+    return None
+
+
+def get_rooted_objects(objects):
+    """
+    Returns the objects that carry a Rooted generator modifier.
+    """
+    return [obj for obj in objects if get_generator_modifier(obj) is not None]
+
+
+def _hashable_value(value):
+    if isinstance(value, bpy.types.ID):
+        return value.name_full
+    if isinstance(value, float):
+        return round(value, 6)
+    if hasattr(value, "to_list"):
+        return [_hashable_value(v) for v in value.to_list()]
+    return value
+
+
+def variant_hash(mod, *extra):
+    """
+    Returns a stable hash of the generator inputs of a Rooted modifier.
+
+    Plants that share a preset, season and seed get the same hash, so it can
+    be used as a cache key for anything derived from the generated geometry.
+    Extra values (bake settings, resolutions...) are mixed into the hash.
+    """
+    digest = hashlib.sha1(mod.node_group.name.encode())
+    for item in mod.node_group.interface.items_tree:
+        if item.item_type != 'SOCKET' or item.in_out != 'INPUT':
+            continue
+        if item.identifier not in mod:
+            continue
+        value = _hashable_value(mod[item.identifier])
+        digest.update(f"{item.identifier}={value!r};".encode())
+    for value in extra:
+        digest.update(f"{_hashable_value(value)!r};".encode())
+    return digest.hexdigest()
+
+
+def get_cache_dir(*subdirs):
+    """
+    Returns the add-on's user cache directory, creating it if needed.
+    Legacy (bl_info) installs are not extensions, so their cache lives in
+    the user datafiles directory instead.
+    """
+    path = os.path.join("cache", *subdirs)
+    if ADDON_PACKAGE.startswith("bl_ext."):
+        return bpy.utils.extension_path_user(ADDON_PACKAGE, path=path, create=True)
+    return bpy.utils.user_resource('DATAFILES', path=os.path.join(ADDON_PACKAGE, path), create=True)
+
+
+def get_view_location(context):
+    """
+    Returns the world-space location LOD decisions are measured from: the
+    active camera if there is one, otherwise the first 3D viewport.
+    """
+    if context.scene.camera is not None:
+        return context.scene.camera.matrix_world.translation.copy()
+    # Timers run without a window in the context, so fall back to any window
+    screens = [context.screen] if context.screen else [window.screen for window in context.window_manager.windows]
+    for screen in screens:
+        for area in screen.areas:
+            if area.type == 'VIEW_3D':
+                return area.spaces.active.region_3d.view_matrix.inverted().translation.copy()
+    return None
+
+
+def spawn_worker(script, *args, log_path=None, threads=0):
+    """
+    Starts a headless Blender process running one of the add-on's worker
+    scripts. Output goes to log_path so a chatty worker can never block.
+    """
+    command = [bpy.app.binary_path, "--background", "--factory-startup", "--python-exit-code", "1"]
+    if threads:
+        command += ["--threads", str(threads)]
+    command += ["--python", os.path.join(get_addon_filepath(), "workers", script), "--"]
+    command += [str(arg) for arg in args]
+
+    if log_path is None:
+        return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    with open(log_path, "w") as log:
+        return subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+
+
+classes = []
@@ -0,0 +1,216 @@
+import bpy
+import fnmatch
+
+import numpy as np
+from . import get_rooted_objects
+from .fingerprint_operators import ATTRIBUTE_LAYOUT, fingerprint_plants
+
+
+BAKED_KEY = "rooted_baked"
+REALIZE_NAME = "Rooted Realize"
+
+# Attributes Blender itself relies on, never stripped
+BUILTIN_ATTRIBUTES = {"position", "material_index", "sharp_face", "sharp_edge", "custom_normal"}
+
+# Bytes per element of each attribute data type
+ATTRIBUTE_BYTES = {
+    'FLOAT': 4, 'INT': 4, 'INT8': 1, 'BOOLEAN': 1, 'FLOAT2': 8, 'INT32_2D': 8,
+    'FLOAT_VECTOR': 12, 'FLOAT_COLOR': 16, 'BYTE_COLOR': 4, 'QUATERNION': 16, 'FLOAT4X4': 64,
+}
+
+
+def get_realize_group():
+    """Returns a node group that realizes instances, so leaves end up in the baked mesh."""
+    group = bpy.data.node_groups.get(REALIZE_NAME)
+    if group is not None:
+        return group
+
+    group = bpy.data.node_groups.new(REALIZE_NAME, 'GeometryNodeTree')
+    group.interface.new_socket(name="Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    group.interface.new_socket(name="Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    group_input = group.nodes.new("NodeGroupInput")
+    realize = group.nodes.new("GeometryNodeRealizeInstances")
+    group_output = group.nodes.new("NodeGroupOutput")
+    group.links.new(group_input.outputs[0], realize.inputs[0])
+    group.links.new(realize.outputs[0], group_output.inputs[0])
+    return group
+
+
+def _node_tree_attributes(tree, names):
+    for node in tree.nodes:
+        if node.bl_idname == 'ShaderNodeAttribute' and node.attribute_type in {'GEOMETRY', 'INSTANCER'}:
+            names.add(node.attribute_name)
+        elif node.bl_idname == 'ShaderNodeVertexColor':
+            names.add(node.layer_name)
+        elif node.bl_idname in {'ShaderNodeUVMap', 'ShaderNodeNormalMap', 'ShaderNodeTangent'}:
+            names.add(node.uv_map)
+        elif node.bl_idname == 'ShaderNodeGroup' and node.node_tree is not None:
+            _node_tree_attributes(node.node_tree, names)
+
+
+def required_attributes(mesh, patterns):
+    """
+    Returns the attribute names the mesh has to keep: those its materials
+    read, the active UV map and color, and anything matching the exporter
+    keep patterns.
+    """
+    names = set()
+    for material in mesh.materials:
+        if material is not None and material.use_nodes:
+            _node_tree_attributes(material.node_tree, names)
+    if mesh.uv_layers.active is not None:
+        names.add(mesh.uv_layers.active.name)
+    if mesh.color_attributes.active_color is not None:
+        names.add(mesh.color_attributes.active_color.name)
+    for attribute in mesh.attributes:
+        if any(fnmatch.fnmatch(attribute.name, pattern) for pattern in patterns):
+            names.add(attribute.name)
+    return names
+
+
+def attributes_size(mesh):
+    """Returns the memory taken by the public attributes of a mesh, in bytes."""
+    return sum(
+        len(attribute.data) * ATTRIBUTE_BYTES.get(attribute.data_type, 0)
+        for attribute in mesh.attributes
+        if not attribute.name.startswith(".")
+    )
+
+
+def _read(attribute):
+    key, components, dtype = ATTRIBUTE_LAYOUT[attribute.data_type]
+    values = np.empty(len(attribute.data) * components, dtype=dtype)
+    attribute.data.foreach_get(key, values)
+    return values.reshape(-1, components)
+
+
+def _replace(mesh, name, data_type, domain, values):
+    mesh.attributes.remove(mesh.attributes[name])
+    key, _components, dtype = ATTRIBUTE_LAYOUT[data_type]
+    mesh.attributes.new(name, data_type, domain).data.foreach_set(key, values.astype(dtype).ravel())
+
+
+def compact_attributes(mesh):
+    """
+    Shrinks attributes where it cannot change how they are read:
+    corner values that agree on every vertex move to the point domain,
+    [0, 1] colors become 8-bit byte colors and small integers become INT8.
+    Scalar floats (wind weights...) stay FLOAT: byte colors are stored
+    sRGB-encoded and exporters would no longer see them as linear weights.
+    """
+    corner_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", corner_verts)
+    uv_names = {layer.name for layer in mesh.uv_layers}
+    active_color = mesh.color_attributes.active_color_name
+
+    for name in list(mesh.attributes.keys()):
+        attribute = mesh.attributes[name]
+        if name.startswith(".") or name in BUILTIN_ATTRIBUTES or name in uv_names:
+            continue
+        if attribute.data_type not in ATTRIBUTE_LAYOUT:
+            continue
+
+        data_type, domain = attribute.data_type, attribute.domain
+        values = _read(attribute)
+
+        if domain == 'CORNER':
+            per_point = np.zeros((len(mesh.vertices), values.shape[1]), dtype=values.dtype)
+            per_point[corner_verts] = values
+            if np.array_equal(per_point[corner_verts], values):
+                domain, values = 'POINT', per_point
+
+        if data_type == 'FLOAT_COLOR' and values.min() >= 0.0 and values.max() <= 1.0:
+            data_type = 'BYTE_COLOR'
+        elif data_type == 'INT' and values.min() >= -128 and values.max() <= 127:
+            data_type = 'INT8'
+
+        if (data_type, domain) != (attribute.data_type, attribute.domain):
+            _replace(mesh, name, data_type, domain, values)
+
+    if active_color and active_color in mesh.color_attributes:
+        mesh.color_attributes.active_color_name = active_color
+        mesh.color_attributes.render_color_index = mesh.color_attributes.active_color_index
+
+
+def bake_mesh(context, plant):
+    """
+    Returns a new mesh with the fully realized geometry of a plant: bark
+    and leaves, with every attribute the node group produced.
+    """
+    realize = plant.modifiers.new(name="Rooted Realize", type='NODES')
+    realize.node_group = get_realize_group()
+    try:
+        depsgraph = context.evaluated_depsgraph_get()
+        depsgraph.update()
+        return bpy.data.meshes.new_from_object(plant.evaluated_get(depsgraph), preserve_all_data_layers=True, depsgraph=depsgraph)
+    finally:
+        plant.modifiers.remove(realize)
+
+
+def apply_attribute_policy(mesh, policy, patterns):
+    """
+    Strips the attributes no material or exporter needs ('STRIP'), and also
+    compacts the remaining ones ('COMPACT'). Returns the bytes saved.
+    """
+    before = attributes_size(mesh)
+    if policy in {'STRIP', 'COMPACT'}:
+        keep = required_attributes(mesh, patterns)
+        for name in list(mesh.attributes.keys()):
+            if name.startswith(".") or name in BUILTIN_ATTRIBUTES or name in keep:
+                continue
+            mesh.attributes.remove(mesh.attributes[name])
+    if policy == 'COMPACT':
+        compact_attributes(mesh)
+    return before - attributes_size(mesh)
+
+
+class ROOTED_OT_BakePlants(bpy.types.Operator):
+    bl_idname = "rooted.bake_plants"
+    bl_label = "Bake Plants"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Apply the generator of the selected plants into lean static meshes"
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_rooted_objects(context.selected_objects))
+
+    def execute(self, context):
+        scene = context.scene
+        plants = get_rooted_objects(context.selected_objects)
+        patterns = [pattern.strip() for pattern in scene.bake_keep_attributes.split(",") if pattern.strip()]
+        try:
+            fingerprints = fingerprint_plants(context, plants)
+        except RuntimeError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        # Identical plants share one baked mesh
+        baked = {}
+        saved_total = 0
+        for plant in plants:
+            fingerprint = fingerprints[plant.name]
+            if fingerprint not in baked:
+                mesh = bake_mesh(context, plant)
+                mesh.name = f"{plant.name} Baked"
+                saved = apply_attribute_policy(mesh, scene.bake_attribute_policy, patterns)
+                baked[fingerprint] = (mesh, saved)
+                self.report({'INFO'}, f"{plant.name}: {saved / 1024:.1f} KiB of attributes saved")
+
+            mesh, saved = baked[fingerprint]
+            saved_total += saved
+            old = plant.data
+            plant.modifiers.clear()
+            plant.data = mesh
+            if old.users == 0:
+                bpy.data.meshes.remove(old)
+            plant[BAKED_KEY] = fingerprint
+            plant["rooted_bake_saved"] = saved
+
+        self.report({'INFO'}, f"Baked {len(plants)} plant(s) into {len(baked)} mesh(es), {saved_total / 1024 ** 2:.2f} MiB of attributes saved")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+classes = [ROOTED_OT_BakePlants]
@@ -38,6 +38,102 @@ SOCKET = {
 }
 
 
+def apply_bush_settings(mod, scene):
+    """
+    Applies the bush preset and season selected in the scene to a generator modifier.
+    """
+    # Bush base settings: no trunk, branches point upward, dense foliage
+    # These get overridden by presets below, but set sensible defaults
+    mod[SOCKET["trunk"]] = 0  # No stem
+    mod[SOCKET["minHeight"]] = 0  # Branches from ground level
+
+    # Apply preset (all based on user-tested MEDIUM values)
+    if scene.bush_preset == 'SMALL':
+        # Compact, less complex version
+        mod[SOCKET["nBranches"]] = 0  # Two Branches
+        mod[SOCKET["treetop"]] = 1
+        mod[SOCKET["numLevels"]] = 4
+        mod[SOCKET["bLength"]] = 3
+        mod[SOCKET["rAngle"]] = math.radians(24.0)
+        mod[SOCKET["rJitter"]] = 0.2
+        mod[SOCKET["gravity"]] = 2.2
+        mod[SOCKET["thickness"]] = 1.0
+        mod[SOCKET["leafDensity"]] = 0.66
+        mod[SOCKET["leafMinScale"]] = 0.25
+        mod[SOCKET["leafMaxScale"]] = 0.8
+        mod[SOCKET["scale"]] = 0.5
+
+    elif scene.bush_preset == 'MEDIUM':
+        # User-tested values
+        mod[SOCKET["nBranches"]] = 0  # Two Branches
+        mod[SOCKET["treetop"]] = 1
+        mod[SOCKET["numLevels"]] = 5
+        mod[SOCKET["bLength"]] = 4
+        mod[SOCKET["rAngle"]] = math.radians(25.2)
+        mod[SOCKET["rJitter"]] = 0.2
+        mod[SOCKET["gravity"]] = 2.4
+        mod[SOCKET["thickness"]] = 1.3
+        mod[SOCKET["leafDensity"]] = 0.66
+        mod[SOCKET["leafMinScale"]] = 0.3
+        mod[SOCKET["leafMaxScale"]] = 1.0
+        mod[SOCKET["scale"]] = 0.6
+
+    elif scene.bush_preset == 'LARGE':
+        # Bigger, more sprawling
+        mod[SOCKET["nBranches"]] = 0  # Two Branches
+        mod[SOCKET["treetop"]] = 2
+        mod[SOCKET["numLevels"]] = 6
+        mod[SOCKET["bLength"]] = 5
+        mod[SOCKET["rAngle"]] = math.radians(26.0)
+        mod[SOCKET["rJitter"]] = 0.2
+        mod[SOCKET["gravity"]] = 2.6
+        mod[SOCKET["thickness"]] = 1.5
+        mod[SOCKET["leafDensity"]] = 0.66
+        mod[SOCKET["leafMinScale"]] = 0.35
+        mod[SOCKET["leafMaxScale"]] = 1.0
+        mod[SOCKET["scale"]] = 0.8
+
+    elif scene.bush_preset == 'HEDGE':
+        # More vertical, compact for hedges
+        mod[SOCKET["nBranches"]] = 0  # Two Branches
+        mod[SOCKET["treetop"]] = 1
+        mod[SOCKET["numLevels"]] = 5
+        mod[SOCKET["bLength"]] = 3
+        mod[SOCKET["rAngle"]] = math.radians(18.0)  # More upward
+        mod[SOCKET["rJitter"]] = 0.15
+        mod[SOCKET["gravity"]] = 1.5  # Less droop for vertical shape
+        mod[SOCKET["thickness"]] = 1.0
+        mod[SOCKET["leafDensity"]] = 0.75
+        mod[SOCKET["leafMinScale"]] = 0.2
+        mod[SOCKET["leafMaxScale"]] = 0.7
+        mod[SOCKET["scale"]] = 0.7
+
+    elif scene.bush_preset == 'CUSTOM':
+        mod[SOCKET["nBranches"]] = 0 if scene.bush_custom_n_branches == 2 else 1  # 0=Two, 1=Three
+        mod[SOCKET["treetop"]] = scene.bush_custom_spread
+        mod[SOCKET["numLevels"]] = scene.bush_custom_levels
+        mod[SOCKET["bLength"]] = scene.bush_custom_branch_length
+        mod[SOCKET["rAngle"]] = scene.bush_custom_branch_angle
+        mod[SOCKET["rJitter"]] = scene.bush_custom_jitter
+        mod[SOCKET["gravity"]] = scene.bush_custom_gravity
+        mod[SOCKET["thickness"]] = scene.bush_custom_thickness
+        mod[SOCKET["addLeaves"]] = scene.bush_custom_add_leaves
+        mod[SOCKET["leafDensity"]] = scene.bush_custom_leaf_density
+        mod[SOCKET["leafMinScale"]] = scene.bush_custom_leaf_min_scale
+        mod[SOCKET["leafMaxScale"]] = scene.bush_custom_leaf_max_scale
+        mod[SOCKET["scale"]] = scene.bush_custom_scale
+
+    # Apply season
+    if scene.bush_season == 'SPRING':
+        mod[SOCKET["season"]] = 0.0
+    elif scene.bush_season == 'SUMMER':
+        mod[SOCKET["season"]] = 0.5
+    elif scene.bush_season == 'CUSTOM':
+        mod[SOCKET["season"]] = scene.bush_custom_season_value
+    else:
+        mod[SOCKET["season"]] = 1.0
+
+
 class ROOTED_OT_BushHideLeaves(bpy.types.Operator):
     bl_idname = "rooted.bush_hide_leaves"
     bl_label = "Hide Leaves"
@@ -122,96 +218,7 @@ class ROOTED_OT_AddBush(bpy.types.Operator):
                 self.report({'ERROR'}, f"Error appending node group: {e}")
                 return {'CANCELLED'}
 
-        # Bush base settings: no trunk, branches point upward, dense foliage
-        # These get overridden by presets below, but set sensible defaults
-        mod[SOCKET["trunk"]] = 0  # No stem
-        mod[SOCKET["minHeight"]] = 0  # Branches from ground level
-
-        # Apply preset (all based on user-tested MEDIUM values)
-        if context.scene.bush_preset == 'SMALL':
-            # Compact, less complex version
-            mod[SOCKET["nBranches"]] = 0  # Two Branches
-            mod[SOCKET["treetop"]] = 1
-            mod[SOCKET["numLevels"]] = 4
-            mod[SOCKET["bLength"]] = 3
-            mod[SOCKET["rAngle"]] = math.radians(24.0)
-            mod[SOCKET["rJitter"]] = 0.2
-            mod[SOCKET["gravity"]] = 2.2
-            mod[SOCKET["thickness"]] = 1.0
-            mod[SOCKET["leafDensity"]] = 0.66
-            mod[SOCKET["leafMinScale"]] = 0.25
-            mod[SOCKET["leafMaxScale"]] = 0.8
-            mod[SOCKET["scale"]] = 0.5
-
-        elif context.scene.bush_preset == 'MEDIUM':
-            # User-tested values
-            mod[SOCKET["nBranches"]] = 0  # Two Branches
-            mod[SOCKET["treetop"]] = 1
-            mod[SOCKET["numLevels"]] = 5
-            mod[SOCKET["bLength"]] = 4
-            mod[SOCKET["rAngle"]] = math.radians(25.2)
-            mod[SOCKET["rJitter"]] = 0.2
-            mod[SOCKET["gravity"]] = 2.4
-            mod[SOCKET["thickness"]] = 1.3
-            mod[SOCKET["leafDensity"]] = 0.66
-            mod[SOCKET["leafMinScale"]] = 0.3
-            mod[SOCKET["leafMaxScale"]] = 1.0
-            mod[SOCKET["scale"]] = 0.6
-
-        elif context.scene.bush_preset == 'LARGE':
-            # Bigger, more sprawling
-            mod[SOCKET["nBranches"]] = 0  # Two Branches
-            mod[SOCKET["treetop"]] = 2
-            mod[SOCKET["numLevels"]] = 6
-            mod[SOCKET["bLength"]] = 5
-            mod[SOCKET["rAngle"]] = math.radians(26.0)
-            mod[SOCKET["rJitter"]] = 0.2
-            mod[SOCKET["gravity"]] = 2.6
-            mod[SOCKET["thickness"]] = 1.5
-            mod[SOCKET["leafDensity"]] = 0.66
-            mod[SOCKET["leafMinScale"]] = 0.35
-            mod[SOCKET["leafMaxScale"]] = 1.0
-            mod[SOCKET["scale"]] = 0.8
-
-        elif context.scene.bush_preset == 'HEDGE':
-            # More vertical, compact for hedges
-            mod[SOCKET["nBranches"]] = 0  # Two Branches
-            mod[SOCKET["treetop"]] = 1
-            mod[SOCKET["numLevels"]] = 5
-            mod[SOCKET["bLength"]] = 3
-            mod[SOCKET["rAngle"]] = math.radians(18.0)  # More upward
-            mod[SOCKET["rJitter"]] = 0.15
-            mod[SOCKET["gravity"]] = 1.5  # Less droop for vertical shape
-            mod[SOCKET["thickness"]] = 1.0
-            mod[SOCKET["leafDensity"]] = 0.75
-            mod[SOCKET["leafMinScale"]] = 0.2
-            mod[SOCKET["leafMaxScale"]] = 0.7
-            mod[SOCKET["scale"]] = 0.7
-
-        elif context.scene.bush_preset == 'CUSTOM':
-            mod[SOCKET["nBranches"]] = 0 if context.scene.bush_custom_n_branches == 2 else 1  # 0=Two, 1=Three
-            mod[SOCKET["treetop"]] = context.scene.bush_custom_spread
-            mod[SOCKET["numLevels"]] = context.scene.bush_custom_levels
-            mod[SOCKET["bLength"]] = context.scene.bush_custom_branch_length
-            mod[SOCKET["rAngle"]] = context.scene.bush_custom_branch_angle
-            mod[SOCKET["rJitter"]] = context.scene.bush_custom_jitter
-            mod[SOCKET["gravity"]] = context.scene.bush_custom_gravity
-            mod[SOCKET["thickness"]] = context.scene.bush_custom_thickness
-            mod[SOCKET["addLeaves"]] = context.scene.bush_custom_add_leaves
-            mod[SOCKET["leafDensity"]] = context.scene.bush_custom_leaf_density
-            mod[SOCKET["leafMinScale"]] = context.scene.bush_custom_leaf_min_scale
-            mod[SOCKET["leafMaxScale"]] = context.scene.bush_custom_leaf_max_scale
-            mod[SOCKET["scale"]] = context.scene.bush_custom_scale
-
-        # Apply season
-        if context.scene.bush_season == 'SPRING':
-            mod[SOCKET["season"]] = 0.0
-        elif context.scene.bush_season == 'SUMMER':
-            mod[SOCKET["season"]] = 0.5
-        elif context.scene.bush_season == 'CUSTOM':
-            mod[SOCKET["season"]] = context.scene.bush_custom_season_value
-        else:
-            mod[SOCKET["season"]] = 1.0
+        apply_bush_settings(mod, context.scene)
 
         mod[SOCKET["seed"]] = context.scene.bush_seed
 
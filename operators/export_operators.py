@@ -0,0 +1,107 @@
+import bpy
+import time
+
+from mathutils import Matrix
+from bpy_extras.io_utils import ExportHelper
+from . import get_rooted_objects
+from .fingerprint_operators import fingerprint_plants
+
+
+class ROOTED_OT_ExportInstanced(bpy.types.Operator, ExportHelper):
+    bl_idname = "rooted.export_instanced"
+    bl_label = "Export Instanced"
+    bl_options = {'REGISTER'}
+    bl_description = "Export Rooted plants to glTF or USD, writing each unique plant once and every plant as an instance of it"
+
+    filename_ext = ".glb"
+    filter_glob: bpy.props.StringProperty(default="*.glb;*.gltf;*.usd;*.usda;*.usdc", options={'HIDDEN'})
+
+    export_format: bpy.props.EnumProperty(
+        name="Format",
+        items=[
+            ('GLB', "glTF Binary (.glb)", "Single binary glTF file"),
+            ('GLTF_SEPARATE', "glTF Separate (.gltf)", "glTF with separate binary and textures"),
+            ('USD', "USD (.usdc)", "Universal Scene Description"),
+        ],
+        default='GLB'
+    )
+    selected_only: bpy.props.BoolProperty(
+        name="Selected Only",
+        description="Only export the selected plants",
+        default=False
+    )
+
+    def check(self, context):
+        self.filename_ext = {'GLB': ".glb", 'GLTF_SEPARATE': ".gltf", 'USD': ".usdc"}[self.export_format]
+        return ExportHelper.check(self, context)
+
+    def execute(self, context):
+        objects = context.selected_objects if self.selected_only else context.scene.objects
+        plants = get_rooted_objects(objects)
+        if not plants:
+            self.report({'ERROR'}, "No Rooted plants to export")
+            return {'CANCELLED'}
+
+        start = time.perf_counter()
+        try:
+            fingerprints = fingerprint_plants(context, plants)
+        except RuntimeError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        variants = {}
+        for plant in plants:
+            variants.setdefault(fingerprints[plant.name], []).append(plant)
+
+        # Build a throwaway scene: one prototype collection per unique plant,
+        # and one collection instance per plant carrying its transform
+        export_scene = bpy.data.scenes.new("Rooted Export")
+        prototypes = []
+        try:
+            for key, group in variants.items():
+                collection = bpy.data.collections.new(f"Rooted_{key[:12]}")
+                prototype = group[0].copy()
+                prototype.name = f"Rooted_{key[:12]}"
+                prototype.parent = None
+                prototype.matrix_world = Matrix.Identity(4)
+                collection.objects.link(prototype)
+                prototypes.append((collection, prototype))
+
+                for plant in group:
+                    instance = bpy.data.objects.new(f"{plant.name}_instance", None)
+                    instance.instance_type = 'COLLECTION'
+                    instance.instance_collection = collection
+                    instance.matrix_world = plant.matrix_world
+                    export_scene.collection.objects.link(instance)
+
+            # Override the scene rather than switching the window, which is None in background runs
+            with context.temp_override(scene=export_scene, view_layer=export_scene.view_layers[0]):
+                if self.export_format == 'USD':
+                    bpy.ops.wm.usd_export(
+                        filepath=self.filepath,
+                        selected_objects_only=False,
+                        export_animation=False,
+                        use_instancing=True,
+                    )
+                else:
+                    bpy.ops.export_scene.gltf(
+                        filepath=self.filepath,
+                        export_format=self.export_format,
+                        use_active_scene=True,
+                        export_apply=True,
+                        export_gn_mesh=True,
+                        export_gpu_instances=True,
+                    )
+        finally:
+            for obj in list(export_scene.collection.objects):
+                bpy.data.objects.remove(obj)
+            for collection, prototype in prototypes:
+                bpy.data.objects.remove(prototype)
+                bpy.data.collections.remove(collection)
+            bpy.data.scenes.remove(export_scene)
+
+        self.report({'INFO'}, f"Exported {len(plants)} plant(s) as {len(variants)} unique mesh(es) in {time.perf_counter() - start:.2f}s")
+        return {'FINISHED'}
+
+
+classes = [ROOTED_OT_ExportInstanced]
@@ -0,0 +1,241 @@
+import bpy
+import re
+import json
+import time
+import hashlib
+
+import numpy as np
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+from . import get_generator_modifier, get_rooted_objects, variant_hash
+
+
+FINGERPRINT_KEY = "rooted_fingerprint"
+
+# Positions closer than this are treated as identical when fingerprinting
+QUANTIZE = 1e-5
+
+# foreach_get key and component count of each attribute data type
+ATTRIBUTE_LAYOUT = {
+    'FLOAT': ("value", 1, np.float32),
+    'INT': ("value", 1, np.int32),
+    'INT8': ("value", 1, np.int32),
+    'BOOLEAN': ("value", 1, bool),
+    'FLOAT2': ("vector", 2, np.float32),
+    'INT32_2D': ("value", 2, np.int32),
+    'FLOAT_VECTOR': ("vector", 3, np.float32),
+    'FLOAT_COLOR': ("color", 4, np.float32),
+    'BYTE_COLOR': ("color", 4, np.float32),
+    'QUATERNION': ("value", 4, np.float32),
+    'FLOAT4X4': ("value", 16, np.float32),
+}
+
+
+def _reference_name(datablock, portable):
+    """
+    Returns the name a material or instance reference is hashed under.
+    Within a file this is the full name, so distinct datablocks never hash
+    alike. Portable hashes drop the numeric suffix Blender adds on name
+    clashes (".001"), which depends on append order and on what the file
+    already contains.
+    """
+    if not isinstance(datablock, bpy.types.ID):
+        return ""
+    if portable:
+        return re.sub(r"\.\d{3,}$", "", datablock.name)
+    return datablock.name_full
+
+
+def _quantized(values):
+    return np.round(values / QUANTIZE).astype(np.int64)
+
+
+def _hash_attribute(digest, attribute, size):
+    key, components, dtype = ATTRIBUTE_LAYOUT[attribute.data_type]
+    values = np.empty(size * components, dtype=dtype)
+    attribute.data.foreach_get(key, values)
+    if dtype == np.float32:
+        values = _quantized(values)
+    digest.update(f"{attribute.name}:{attribute.domain}:{attribute.data_type};".encode())
+    digest.update(values.tobytes())
+
+
+def _domain_size(mesh, domain):
+    return {
+        'POINT': len(mesh.vertices),
+        'EDGE': len(mesh.edges),
+        'FACE': len(mesh.polygons),
+        'CORNER': len(mesh.loops),
+    }.get(domain, 0)
+
+
+def fingerprint_geometry(eval_obj, portable=False):
+    """
+    Returns a stable hash of the evaluated geometry of a plant: quantized
+    mesh positions, topology, materials and all public attributes (UVs,
+    season colors...), plus the references and transforms of its
+    instances (leaves). Pass portable=True to compare across files.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    geometry = eval_obj.evaluated_geometry()
+
+    mesh = geometry.mesh
+    if mesh is not None:
+        positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.attributes["position"].data.foreach_get("vector", positions)
+        loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_totals)
+        corner_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", corner_verts)
+        for array in (_quantized(positions), loop_totals, corner_verts):
+            digest.update(array.tobytes())
+
+        digest.update("|".join(_reference_name(m, portable) for m in mesh.materials).encode())
+        for name in sorted(mesh.attributes.keys()):
+            attribute = mesh.attributes[name]
+            if name == "position" or name.startswith(".") or attribute.data_type not in ATTRIBUTE_LAYOUT:
+                continue
+            _hash_attribute(digest, attribute, _domain_size(mesh, attribute.domain))
+
+    instances = geometry.instances_pointcloud()
+    if instances is not None:
+        count = len(instances.points)
+        transforms = np.empty(count * 16, dtype=np.float32)
+        instances.attributes["instance_transform"].data.foreach_get("value", transforms)
+        references = np.empty(count, dtype=np.int32)
+        instances.attributes[".reference_index"].data.foreach_get("value", references)
+        names = [_reference_name(reference, portable) for reference in geometry.instance_references()]
+        digest.update("|".join(names).encode())
+        for array in (_quantized(transforms), references):
+            digest.update(array.tobytes())
+
+    return digest.hexdigest()
+
+
+def fingerprint_plants(context, plants, exact=False, portable=False):
+    """
+    Fingerprints plants and stores each hash on its object. Returns a dict
+    mapping plant names to fingerprints.
+
+    Geometry Nodes evaluation is deterministic, so plants whose only
+    modifier is the generator with identical inputs share one hash and are
+    hashed once. Pass exact=True to hash every plant, e.g. for
+    determinism checks, and portable=True for hashes that are compared
+    across files. Portable hashes are not stored, since deduplication
+    relies on the stored ones. Raises RuntimeError if a plant is not
+    evaluated in the view layer.
+    """
+    depsgraph = context.evaluated_depsgraph_get()
+
+    # Hidden plants and plants in excluded tiles are not evaluated, so their
+    # evaluated_get() is the original object with no generated geometry
+    skipped = [plant.name for plant in plants if plant.evaluated_get(depsgraph) == plant]
+    if skipped:
+        raise RuntimeError(f"{len(skipped)} plant(s) are hidden or in excluded tiles and cannot be fingerprinted: "
+                           f"{', '.join(skipped[:10])}")
+
+    by_variant = {}
+    fingerprints = {}
+    for plant in plants:
+        key = None
+        if not exact and len(plant.modifiers) == 1:
+            key = variant_hash(get_generator_modifier(plant))
+        fingerprint = by_variant.get(key) if key else None
+        if fingerprint is None:
+            fingerprint = fingerprint_geometry(plant.evaluated_get(depsgraph), portable)
+            if key:
+                by_variant[key] = fingerprint
+        if not portable and plant.get(FINGERPRINT_KEY) != fingerprint:
+            plant[FINGERPRINT_KEY] = fingerprint
+        fingerprints[plant.name] = fingerprint
+    return fingerprints
+
+
+class ROOTED_OT_ComputeFingerprints(bpy.types.Operator):
+    bl_idname = "rooted.compute_fingerprints"
+    bl_label = "Compute Fingerprints"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Hash the evaluated geometry of Rooted plants and store it on each object"
+
+    selected_only: bpy.props.BoolProperty(
+        name="Selected Only",
+        description="Only fingerprint the selected plants",
+        default=False
+    )
+    exact: bpy.props.BoolProperty(
+        name="Exact",
+        description="Hash every plant instead of reusing hashes of plants with identical generator inputs",
+        default=False
+    )
+
+    def execute(self, context):
+        objects = context.selected_objects if self.selected_only else context.scene.objects
+        plants = get_rooted_objects(objects)
+        start = time.perf_counter()
+        try:
+            fingerprints = fingerprint_plants(context, plants, exact=self.exact)
+        except RuntimeError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Fingerprinted {len(plants)} plant(s), {len(set(fingerprints.values()))} unique, in {time.perf_counter() - start:.2f}s")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+class ROOTED_OT_WriteFingerprints(bpy.types.Operator, ExportHelper):
+    bl_idname = "rooted.write_fingerprints"
+    bl_label = "Write Fingerprints"
+    bl_options = {'REGISTER'}
+    bl_description = "Write the exact fingerprints of all Rooted plants to a JSON reference file"
+
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    def execute(self, context):
+        plants = get_rooted_objects(context.scene.objects)
+        try:
+            fingerprints = fingerprint_plants(context, plants, exact=True, portable=True)
+        except RuntimeError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        with open(self.filepath, "w") as f:
+            json.dump({"blender": bpy.app.version_string, "fingerprints": fingerprints}, f, indent=2, sort_keys=True)
+
+        self.report({'INFO'}, f"Wrote {len(fingerprints)} fingerprint(s)")
+        return {'FINISHED'}
+
+
+class ROOTED_OT_CompareFingerprints(bpy.types.Operator, ImportHelper):
+    bl_idname = "rooted.compare_fingerprints"
+    bl_label = "Compare Fingerprints"
+    bl_options = {'REGISTER'}
+    bl_description = "Compare the exact fingerprints of all Rooted plants against a JSON reference file"
+
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    def execute(self, context):
+        with open(self.filepath) as f:
+            reference = json.load(f)
+        plants = get_rooted_objects(context.scene.objects)
+        try:
+            fingerprints = fingerprint_plants(context, plants, exact=True, portable=True)
+        except RuntimeError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        expected = reference["fingerprints"]
+        mismatched = sorted(name for name in expected.keys() & fingerprints.keys() if expected[name] != fingerprints[name])
+        missing = sorted(expected.keys() - fingerprints.keys())
+        if mismatched or missing:
+            self.report({'ERROR'}, f"{len(mismatched)} plant(s) differ from Blender {reference['blender']}, "
+                                   f"{len(missing)} missing: {', '.join((mismatched + missing)[:10])}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"All {len(expected)} plant(s) match Blender {reference['blender']}")
+        return {'FINISHED'}
+
+
+classes = [ROOTED_OT_ComputeFingerprints, ROOTED_OT_WriteFingerprints, ROOTED_OT_CompareFingerprints]
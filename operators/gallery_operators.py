@@ -0,0 +1,213 @@
+import bpy
+import os
+import uuid
+import bmesh
+import bpy.utils.previews
+from . import load_generator, variant_hash, get_cache_dir, spawn_worker
+from .tree_operators import SOCKET, apply_tree_settings
+from .bush_operators import apply_bush_settings
+
+
+# (seed, cache key) of every thumbnail shown in the gallery panel
+gallery_items = []
+
+_previews = None
+
+# True while a gallery render is running, only one may run at a time
+_rendering = False
+
+
+def get_previews():
+    """Returns the preview collection holding the loaded gallery thumbnails."""
+    global _previews
+    if _previews is None:
+        _previews = bpy.utils.previews.new()
+    return _previews
+
+
+def free_previews():
+    global _previews
+    if _previews is not None:
+        bpy.utils.previews.remove(_previews)
+        _previews = None
+    gallery_items.clear()
+
+
+def gallery_path(key):
+    return os.path.join(get_cache_dir("gallery"), f"{key}.png")
+
+
+def load_thumbnail(key):
+    """Loads a cached thumbnail into the previews. Returns False if it is not rendered yet."""
+    previews = get_previews()
+    if key in previews:
+        return True
+    path = gallery_path(key)
+    if not os.path.exists(path):
+        return False
+    previews.load(key, path, 'IMAGE')
+    return True
+
+
+def create_template(scene):
+    """
+    Returns a temporary object with a generator modifier set up like the next
+    plant the panel would add: current type, preset and season.
+    """
+    mesh = bpy.data.meshes.new("Rooted Gallery")
+    bm = bmesh.new()
+    bmesh.ops.create_cube(bm, size=2.0)
+    bm.to_mesh(mesh)
+    bm.free()
+
+    obj = bpy.data.objects.new("Rooted Gallery", mesh)
+    mod = obj.modifiers.new(name="Generator", type='NODES')
+    mod.node_group = load_generator()
+    if scene.rooted_type == 'TREE':
+        apply_tree_settings(mod, scene)
+    else:
+        apply_bush_settings(mod, scene)
+    return obj, mod
+
+
+def _tag_redraw(context):
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+class ROOTED_OT_RenderSeedGallery(bpy.types.Operator):
+    bl_idname = "rooted.render_seed_gallery"
+    bl_label = "Render Seed Gallery"
+    bl_description = "Render thumbnails of a range of seeds of the current preset and season in background workers"
+    bl_options = {'REGISTER'}
+
+    _timer = None
+    _processes = None
+    _pending = None
+    _source = None
+
+    @classmethod
+    def poll(cls, context):
+        return not _rendering
+
+    def execute(self, context):
+        global _rendering
+        scene = context.scene
+        if load_generator() is None:
+            self.report({'ERROR'}, "Node Group 'Simple Tree Generator' could not be loaded from the add-on assets")
+            return {'CANCELLED'}
+
+        obj, mod = create_template(scene)
+        gallery_items.clear()
+        jobs = []
+        for seed in range(scene.gallery_seed_start, scene.gallery_seed_start + scene.gallery_count):
+            mod[SOCKET["seed"]] = seed
+            key = variant_hash(mod, "gallery", scene.gallery_size, scene.gallery_samples)
+            gallery_items.append((seed, key))
+            if not load_thumbnail(key):
+                jobs.append((seed, key))
+
+        if jobs:
+            # Unique per run, so a finishing run never deletes another run's source
+            self._source = os.path.join(get_cache_dir("gallery"), f"source_{uuid.uuid4().hex[:12]}.blend")
+            bpy.data.libraries.write(self._source, {obj}, path_remap='ABSOLUTE')
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(mesh)
+        _tag_redraw(context)
+
+        if not jobs:
+            self.report({'INFO'}, f"Reused {len(gallery_items)} cached thumbnail(s)")
+            return {'FINISHED'}
+
+        # Split the seeds evenly and share the CPU threads between the workers
+        count = min(scene.gallery_workers, len(jobs))
+        threads = max(1, (os.cpu_count() or 1) // count)
+        self._processes = []
+        for index in range(count):
+            args = []
+            for seed, key in jobs[index::count]:
+                args += [seed, gallery_path(key)]
+            self._processes.append(spawn_worker(
+                "gallery_worker.py", self._source, "Rooted Gallery", SOCKET["seed"],
+                scene.gallery_size, scene.gallery_samples, *args,
+                log_path=os.path.join(get_cache_dir("gallery"), f"worker_{index}.log"), threads=threads,
+            ))
+
+        _rendering = True
+        self._pending = [key for _seed, key in jobs]
+        self._total = len(jobs)
+        self._timer = context.window_manager.event_timer_add(0.25, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        context.workspace.status_text_set(f"Rooted: rendering 0/{self._total} thumbnail(s) (Esc to cancel)")
+        return {'RUNNING_MODAL'}
+
+    def _cleanup(self, context):
+        global _rendering
+        _rendering = False
+        context.window_manager.event_timer_remove(self._timer)
+        context.workspace.status_text_set(None)
+        if os.path.exists(self._source):
+            os.remove(self._source)
+
+    def cancel(self, context):
+        # Also called by Blender when a file is loaded while rendering
+        for process in self._processes:
+            if process.poll() is None:
+                process.terminate()
+                process.wait()
+        self._cleanup(context)
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.cancel(context)
+            self.report({'WARNING'}, "Seed gallery cancelled")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        # Show every thumbnail as soon as its worker has written it
+        done = [key for key in self._pending if load_thumbnail(key)]
+        if done:
+            self._pending = [key for key in self._pending if key not in done]
+            context.workspace.status_text_set(
+                f"Rooted: rendering {self._total - len(self._pending)}/{self._total} thumbnail(s) (Esc to cancel)")
+            _tag_redraw(context)
+
+        if self._pending and any(process.poll() is None for process in self._processes):
+            return {'PASS_THROUGH'}
+
+        self._cleanup(context)
+        if self._pending:
+            self.report({'WARNING'}, f"{len(self._pending)} thumbnail(s) failed, see the worker logs in {get_cache_dir('gallery')}")
+        else:
+            self.report({'INFO'}, f"Rendered {self._total} thumbnail(s)")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+class ROOTED_OT_PickGallerySeed(bpy.types.Operator):
+    bl_idname = "rooted.pick_gallery_seed"
+    bl_label = "Pick Seed"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Use this seed and add the plant at the 3D cursor"
+
+    seed: bpy.props.IntProperty(name="Seed", min=0)
+
+    def execute(self, context):
+        if context.scene.rooted_type == 'TREE':
+            context.scene.tree_seed = self.seed
+            return bpy.ops.rooted.add_tree()
+        context.scene.bush_seed = self.seed
+        return bpy.ops.rooted.add_bush()
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+classes = [ROOTED_OT_RenderSeedGallery, ROOTED_OT_PickGallerySeed]
@@ -0,0 +1,384 @@
+import bpy
+import os
+import json
+from . import get_generator_modifier, get_rooted_objects, variant_hash, get_cache_dir, get_view_location, spawn_worker
+
+
+IMPOSTOR_KEY = "rooted_impostor"
+
+# Card properties holding the rows of the inverse plant rotation, read by the card shader
+ROTATION_KEYS = ("rooted_impostor_x", "rooted_impostor_y", "rooted_impostor_z")
+
+
+def impostor_hash(mod, scene):
+    """Cache key of the impostor atlases of a plant variant."""
+    return variant_hash(mod, "impostor", scene.impostor_grid, scene.impostor_resolution, scene.impostor_samples)
+
+
+def load_impostor_metadata(cache_dir):
+    """Returns the metadata of a finished bake, or None if it is missing."""
+    path = os.path.join(cache_dir, "impostor.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _math(tree, operation, a, b=None):
+    node = tree.nodes.new("ShaderNodeMath")
+    node.operation = operation
+    for socket, value in zip(node.inputs, (a, b)):
+        if value is None:
+            continue
+        if isinstance(value, bpy.types.NodeSocket):
+            tree.links.new(value, socket)
+        else:
+            socket.default_value = value
+    return node.outputs[0]
+
+
+def _load_image(path, is_data):
+    image = bpy.data.images.load(path, check_existing=True)
+    image.colorspace_settings.is_data = is_data
+    return image
+
+
+def _to_plant_space(tree, rows, vector):
+    """Rotates a world vector by the inverse plant rotation, given as the rows of the matrix."""
+    combine = tree.nodes.new("ShaderNodeCombineXYZ")
+    for row, axis in zip(rows, "XYZ"):
+        dot = tree.nodes.new("ShaderNodeVectorMath")
+        dot.operation = 'DOT_PRODUCT'
+        tree.links.new(row, dot.inputs[0])
+        tree.links.new(vector, dot.inputs[1])
+        tree.links.new(dot.outputs["Value"], combine.inputs[axis])
+    return combine.outputs[0]
+
+
+def _to_world_space(tree, rows, vector):
+    """Rotates a plant-space vector back to world space (the transposed rows)."""
+    separate = tree.nodes.new("ShaderNodeSeparateXYZ")
+    tree.links.new(vector, separate.inputs[0])
+    total = None
+    for row, axis in zip(rows, "XYZ"):
+        scale = tree.nodes.new("ShaderNodeVectorMath")
+        scale.operation = 'SCALE'
+        tree.links.new(row, scale.inputs[0])
+        tree.links.new(separate.outputs[axis], scale.inputs["Scale"])
+        if total is None:
+            total = scale.outputs[0]
+            continue
+        add = tree.nodes.new("ShaderNodeVectorMath")
+        add.operation = 'ADD'
+        tree.links.new(total, add.inputs[0])
+        tree.links.new(scale.outputs[0], add.inputs[1])
+        total = add.outputs[0]
+    return total
+
+
+def get_impostor_material(key, cache_dir, meta):
+    """
+    Returns the card material of an impostor bake, building it on first use.
+
+    The shader turns the view direction into a hemi-octahedral atlas cell,
+    the inverse of the mapping used by workers/impostor_worker.py. The
+    direction is first rotated into the plant's local frame, so rotated
+    plants show the matching view, and the baked normals are rotated back.
+    """
+    name = f"Rooted Impostor {key[:12]}"
+    material = bpy.data.materials.get(name)
+    if material is not None:
+        return material
+
+    grid = meta["grid"]
+    material = bpy.data.materials.new(name)
+    material.use_nodes = True
+    material.use_backface_culling = False
+    tree = material.node_tree
+    bsdf = tree.nodes["Principled BSDF"]
+
+    coords = tree.nodes.new("ShaderNodeTexCoord")
+    geometry = tree.nodes.new("ShaderNodeNewGeometry")
+    rows = []
+    for row_key in ROTATION_KEYS:
+        row = tree.nodes.new("ShaderNodeAttribute")
+        row.attribute_type = 'OBJECT'
+        row.attribute_name = row_key
+        rows.append(row.outputs["Vector"])
+    incoming = tree.nodes.new("ShaderNodeSeparateXYZ")
+    tree.links.new(_to_plant_space(tree, rows, geometry.outputs["Incoming"]), incoming.inputs[0])
+    uv = tree.nodes.new("ShaderNodeSeparateXYZ")
+    tree.links.new(coords.outputs["UV"], uv.inputs[0])
+
+    # Project the (upper hemisphere) view direction onto the octahedron
+    x, y = incoming.outputs["X"], incoming.outputs["Y"]
+    z = _math(tree, 'MAXIMUM', incoming.outputs["Z"], 0.0)
+    length = _math(tree, 'ADD', _math(tree, 'ADD', _math(tree, 'ABSOLUTE', x), _math(tree, 'ABSOLUTE', y)), z)
+    px = _math(tree, 'DIVIDE', x, length)
+    py = _math(tree, 'DIVIDE', y, length)
+
+    atlas = tree.nodes.new("ShaderNodeCombineXYZ")
+    for encoded, local, axis in ((_math(tree, 'ADD', px, py), uv.outputs["X"], "X"),
+                                 (_math(tree, 'SUBTRACT', px, py), uv.outputs["Y"], "Y")):
+        cell = _math(tree, 'MULTIPLY_ADD', encoded, grid * 0.5)
+        cell.node.inputs[2].default_value = grid * 0.5
+        cell = _math(tree, 'MINIMUM', _math(tree, 'FLOOR', _math(tree, 'MAXIMUM', cell, 0.0)), grid - 1)
+        tree.links.new(_math(tree, 'DIVIDE', _math(tree, 'ADD', cell, local), grid), atlas.inputs[axis])
+
+    albedo = tree.nodes.new("ShaderNodeTexImage")
+    albedo.image = _load_image(os.path.join(cache_dir, "albedo.png"), is_data=False)
+    albedo.interpolation = 'Closest'
+    tree.links.new(atlas.outputs[0], albedo.inputs["Vector"])
+    tree.links.new(albedo.outputs["Color"], bsdf.inputs["Base Color"])
+    tree.links.new(albedo.outputs["Alpha"], bsdf.inputs["Alpha"])
+
+    normal = tree.nodes.new("ShaderNodeTexImage")
+    normal.image = _load_image(os.path.join(cache_dir, "normal.png"), is_data=True)
+    normal.interpolation = 'Closest'
+    tree.links.new(atlas.outputs[0], normal.inputs["Vector"])
+    decode = tree.nodes.new("ShaderNodeVectorMath")
+    decode.operation = 'MULTIPLY_ADD'
+    decode.inputs[1].default_value = (2.0, 2.0, 2.0)
+    decode.inputs[2].default_value = (-1.0, -1.0, -1.0)
+    tree.links.new(normal.outputs["Color"], decode.inputs[0])
+    # Normals were baked in the plant's frame, bring them back to world space
+    tree.links.new(_to_world_space(tree, rows, decode.outputs[0]), bsdf.inputs["Normal"])
+
+    material[IMPOSTOR_KEY] = key
+    return material
+
+
+def get_impostor_mesh(key, meta):
+    """Returns the card quad of an impostor bake, building it on first use."""
+    name = f"Rooted Impostor {key[:12]}"
+    mesh = bpy.data.meshes.get(name)
+    if mesh is not None:
+        return mesh
+
+    r = meta["radius"]
+    mesh = bpy.data.meshes.new(name)
+    # Card faces -Y with U along +X and V along +Z, like the bake camera
+    mesh.from_pydata([(-r, 0.0, -r), (r, 0.0, -r), (r, 0.0, r), (-r, 0.0, r)], [], [(0, 1, 2, 3)])
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    for loop, uv in zip(uv_layer.data, ((0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0))):
+        loop.uv = uv
+    mesh.update()
+    return mesh
+
+
+def store_plant_rotation(card, plant):
+    """Stores the inverse rotation of a plant on its card for the card shader."""
+    inverse = plant.matrix_world.to_quaternion().to_matrix().transposed()
+    for key, row in zip(ROTATION_KEYS, inverse):
+        card[key] = list(row)
+
+
+def create_impostor_card(context, plant, key, cache_dir, meta):
+    """Creates (or replaces) the impostor card child of a plant."""
+    for child in list(plant.children):
+        if IMPOSTOR_KEY in child:
+            bpy.data.objects.remove(child)
+
+    mesh = get_impostor_mesh(key, meta)
+    if not mesh.materials:
+        mesh.materials.append(get_impostor_material(key, cache_dir, meta))
+
+    card = bpy.data.objects.new(f"{plant.name} Impostor", mesh)
+    for collection in plant.users_collection:
+        collection.objects.link(card)
+    card.parent = plant
+    card.location = meta["center"]
+    card[IMPOSTOR_KEY] = key
+    store_plant_rotation(card, plant)
+
+    constraint = card.constraints.new('TRACK_TO')
+    constraint.target = context.scene.camera
+    constraint.track_axis = 'TRACK_NEGATIVE_Y'
+    constraint.up_axis = 'UP_Z'
+
+    # Start out opposite to the plant, so re-baking a far plant keeps it visible
+    card.hide_viewport = card.hide_render = not plant.hide_viewport
+    return card
+
+
+def update_impostor_lod(context):
+    """
+    Swaps plants for their impostor cards beyond the impostor distance.
+    Only objects whose state actually changes are touched. Cards face the
+    scene camera, so nothing is swapped without one.
+    """
+    camera = context.scene.camera
+    view = get_view_location(context)
+    if camera is None or view is None:
+        return 0
+
+    distance = context.scene.impostor_distance
+    changed = 0
+    for card in context.scene.objects:
+        plant = card.parent
+        if IMPOSTOR_KEY not in card or plant is None:
+            continue
+        store_plant_rotation(card, plant)
+        for constraint in card.constraints:
+            if constraint.type == 'TRACK_TO' and constraint.target != camera:
+                constraint.target = camera
+        far = (plant.matrix_world.translation - view).length > distance
+        if plant.hide_viewport != far or card.hide_viewport == far:
+            plant.hide_viewport = plant.hide_render = far
+            card.hide_viewport = card.hide_render = not far
+            changed += 1
+    return changed
+
+
+class ROOTED_OT_BakeImpostors(bpy.types.Operator):
+    bl_idname = "rooted.bake_impostors"
+    bl_label = "Bake Impostors"
+    bl_description = "Render impostor atlases for the selected plants in background workers and add impostor cards"
+    bl_options = {'REGISTER'}
+
+    _timer = None
+    _jobs = None
+    _current = None
+    _process = None
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_rooted_objects(context.selected_objects))
+
+    def execute(self, context):
+        if context.scene.camera is None:
+            self.report({'ERROR'}, "Impostor cards face the scene camera, set a scene camera first")
+            return {'CANCELLED'}
+
+        variants = {}
+        for plant in get_rooted_objects(context.selected_objects):
+            key = impostor_hash(get_generator_modifier(plant), context.scene)
+            variants.setdefault(key, []).append(plant)
+
+        self._jobs = []
+        cached = 0
+        for key, plants in variants.items():
+            cache_dir = get_cache_dir("impostors", key)
+            meta = load_impostor_metadata(cache_dir)
+            if meta is None:
+                self._jobs.append((key, cache_dir, plants))
+                continue
+            cached += 1
+            for plant in plants:
+                create_impostor_card(context, plant, key, cache_dir, meta)
+
+        if not self._jobs:
+            update_impostor_lod(context)
+            self.report({'INFO'}, f"Reused {cached} cached impostor variant(s)")
+            return {'FINISHED'}
+
+        self._total = len(self._jobs)
+        self._start_next(context)
+        self._timer = context.window_manager.event_timer_add(0.5, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def _start_next(self, context):
+        key, cache_dir, plants = self._current = self._jobs.pop(0)
+        source = os.path.join(cache_dir, "source.blend")
+        bpy.data.libraries.write(source, {plants[0]}, path_remap='ABSOLUTE')
+        self._process = spawn_worker(
+            "impostor_worker.py", source, plants[0].name, cache_dir,
+            context.scene.impostor_grid, context.scene.impostor_resolution, context.scene.impostor_samples,
+            log_path=os.path.join(cache_dir, "bake.log"),
+        )
+        context.workspace.status_text_set(
+            f"Rooted: baking impostor {self._total - len(self._jobs)}/{self._total} (Esc to cancel)")
+
+    def _finish_current(self, context):
+        key, cache_dir, plants = self._current
+        source = os.path.join(cache_dir, "source.blend")
+        if os.path.exists(source):
+            os.remove(source)
+        meta = load_impostor_metadata(cache_dir)
+        if self._process.returncode != 0 or meta is None:
+            self.report({'WARNING'}, f"Impostor bake failed for {plants[0].name}, see {os.path.join(cache_dir, 'bake.log')}")
+            return
+        for plant in plants:
+            if plant.name in bpy.data.objects:
+                create_impostor_card(context, plant, key, cache_dir, meta)
+
+    def _cleanup(self, context):
+        context.window_manager.event_timer_remove(self._timer)
+        context.workspace.status_text_set(None)
+        source = os.path.join(self._current[1], "source.blend")
+        if os.path.exists(source):
+            os.remove(source)
+
+    def cancel(self, context):
+        # Also called by Blender when a file is loaded while baking
+        if self._process.poll() is None:
+            self._process.terminate()
+            self._process.wait()
+        self._cleanup(context)
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.cancel(context)
+            self.report({'WARNING'}, "Impostor bake cancelled")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER' or self._process.poll() is None:
+            return {'PASS_THROUGH'}
+
+        self._finish_current(context)
+        if self._jobs:
+            self._start_next(context)
+            return {'PASS_THROUGH'}
+
+        self._cleanup(context)
+        update_impostor_lod(context)
+        self.report({'INFO'}, f"Baked {self._total} impostor variant(s)")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+class ROOTED_OT_UpdateImpostorLOD(bpy.types.Operator):
+    bl_idname = "rooted.update_impostor_lod"
+    bl_label = "Update Impostor LOD"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Show impostor cards instead of plants that are farther than the impostor distance from the view"
+
+    def execute(self, context):
+        if context.scene.camera is None:
+            self.report({'ERROR'}, "Impostor cards face the scene camera, set a scene camera first")
+            return {'CANCELLED'}
+
+        changed = update_impostor_lod(context)
+        self.report({'INFO'}, f"Switched {changed} plant(s)")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+class ROOTED_OT_RemoveImpostors(bpy.types.Operator):
+    bl_idname = "rooted.remove_impostors"
+    bl_label = "Remove Impostors"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Remove impostor cards and show the full plants again"
+
+    def execute(self, context):
+        removed = 0
+        for card in list(context.scene.objects):
+            if IMPOSTOR_KEY in card:
+                if card.parent is not None:
+                    card.parent.hide_viewport = card.parent.hide_render = False
+                bpy.data.objects.remove(card)
+                removed += 1
+
+        self.report({'INFO'}, f"Removed {removed} impostor card(s)")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+classes = [ROOTED_OT_BakeImpostors, ROOTED_OT_UpdateImpostorLOD, ROOTED_OT_RemoveImpostors]
@@ -0,0 +1,344 @@
+import bpy
+import os
+import math
+import hashlib
+
+import numpy as np
+from . import get_generator_modifier, get_rooted_objects, get_cache_dir
+from .tree_operators import SOCKET
+from .fingerprint_operators import ATTRIBUTE_LAYOUT
+
+
+LEAF_CARDS_KEY = "rooted_leaf_cards"
+
+# Sprites packed into a cluster texture at density 1.0
+SPRITES_PER_CARD = 10
+
+
+def _material_of(reference):
+    """Returns the first material of an instance reference that samples a LeafSet texture."""
+    if isinstance(reference, bpy.types.Object):
+        materials = [slot.material for slot in reference.material_slots]
+    elif isinstance(reference, bpy.types.Collection):
+        materials = [slot.material for obj in reference.all_objects for slot in obj.material_slots]
+    elif getattr(reference, "mesh", None) is not None:
+        materials = list(reference.mesh.materials)
+    else:
+        materials = []
+
+    for material in materials:
+        if material is None or not material.use_nodes:
+            continue
+        for node in material.node_tree.nodes:
+            if node.bl_idname == 'ShaderNodeTexImage' and node.image and "LeafSet" in node.image.name:
+                return material
+    return None
+
+
+def _triangles_of(reference):
+    mesh = None
+    if isinstance(reference, bpy.types.Object) and reference.type == 'MESH':
+        mesh = reference.data
+    elif getattr(reference, "mesh", None) is not None:
+        mesh = reference.mesh
+    if mesh is None:
+        return 2
+    return sum(polygon.loop_total - 2 for polygon in mesh.polygons)
+
+
+def _image_pixels(image):
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+
+def bake_leaf_set(material, resolution, density):
+    """
+    Composites scattered copies of every LeafSet texture of a leaf material
+    into cluster textures, using one shared layout so color, opacity and
+    the other maps stay aligned. Results are cached on disk per leaf set
+    and settings. Returns a dict mapping source image names to baked images.
+    """
+    sources = {}
+    for node in material.node_tree.nodes:
+        if node.bl_idname == 'ShaderNodeTexImage' and node.image and "LeafSet" in node.image.name:
+            if node.image.size[0] > 0:
+                sources[node.image.name] = node.image
+
+    # "rotated-normals" keeps caches baked before normals were rotated from being reused
+    digest = hashlib.sha1(f"{resolution};{density:.3f};rotated-normals".encode())
+    for name in sorted(sources):
+        digest.update(f"{name}={sources[name].filepath};".encode())
+    cache_dir = get_cache_dir("leaf_cards", digest.hexdigest())
+
+    def cached_path(name):
+        return os.path.join(cache_dir, f"{bpy.path.clean_name(name)}.png")
+
+    if not all(os.path.exists(cached_path(name)) for name in sources):
+        opacity = next((image for name, image in sources.items() if "Opacity" in name), None)
+        color = next((image for name, image in sources.items() if "Color" in name), None)
+        if opacity is not None:
+            alpha_sheet = _image_pixels(opacity)[..., 0]
+        elif color is not None:
+            alpha_sheet = _image_pixels(color)[..., 3]
+        else:
+            return {}
+        sheets = {name: _image_pixels(image) for name, image in sources.items()}
+
+        # Premultiplied "over" compositing of rotated, scaled sprites
+        v, u = (np.mgrid[0:resolution, 0:resolution] + 0.5) / resolution
+        layers = {name: np.zeros((resolution, resolution, 3), dtype=np.float32) for name in sources}
+        coverage = np.zeros((resolution, resolution), dtype=np.float32)
+        rng = np.random.default_rng(0)
+        for _ in range(max(1, round(SPRITES_PER_CARD * density))):
+            cx, cy = rng.uniform(0.3, 0.7, 2)
+            angle = rng.uniform(0.0, 2.0 * math.pi)
+            scale = rng.uniform(0.35, 0.6)
+            cos, sin = math.cos(angle), math.sin(angle)
+            su = (cos * (u - cx) + sin * (v - cy)) / scale + 0.5
+            sv = (-sin * (u - cx) + cos * (v - cy)) / scale + 0.5
+            inside = (su >= 0.0) & (su < 1.0) & (sv >= 0.0) & (sv < 1.0)
+
+            def sample(sheet):
+                h, w = sheet.shape[:2]
+                return sheet[np.clip((sv * h).astype(int), 0, h - 1), np.clip((su * w).astype(int), 0, w - 1)]
+
+            alpha = np.where(inside, sample(alpha_sheet), 0.0)
+            for name, sheet in sheets.items():
+                texel = sample(sheet)[..., :3]
+                if "Normal" in name:
+                    # Tangent-space normals turn with the sprite
+                    x, y = texel[..., 0] * 2.0 - 1.0, texel[..., 1] * 2.0 - 1.0
+                    texel = texel.copy()
+                    texel[..., 0] = (cos * x - sin * y) * 0.5 + 0.5
+                    texel[..., 1] = (sin * x + cos * y) * 0.5 + 0.5
+                layers[name] = texel * alpha[..., None] + layers[name] * (1.0 - alpha[..., None])
+            coverage = alpha + coverage * (1.0 - alpha)
+
+        for name, source in sources.items():
+            pixels = np.empty((resolution, resolution, 4), dtype=np.float32)
+            if "Opacity" in name:
+                pixels[..., :3] = coverage[..., None]
+            else:
+                pixels[..., :3] = layers[name] / np.maximum(coverage, 1e-6)[..., None]
+            pixels[..., 3] = coverage
+            image = bpy.data.images.new(f"{name} Cards", resolution, resolution, alpha=True)
+            image.colorspace_settings.name = source.colorspace_settings.name
+            image.pixels.foreach_set(pixels.ravel())
+            image.filepath_raw = cached_path(name)
+            image.file_format = 'PNG'
+            image.save()
+            bpy.data.images.remove(image)
+
+    baked = {}
+    for name, source in sources.items():
+        image = bpy.data.images.load(cached_path(name), check_existing=True)
+        image.colorspace_settings.name = source.colorspace_settings.name
+        baked[name] = image
+    return baked
+
+
+def get_card_material(material, resolution, density):
+    """Returns a copy of a leaf material that samples the baked cluster textures."""
+    baked = bake_leaf_set(material, resolution, density)
+    name = f"{material.name} Cards {resolution}_{density:.2f}"
+    card_material = bpy.data.materials.get(name)
+    if card_material is not None:
+        return card_material
+
+    card_material = material.copy()
+    card_material.name = name
+    for node in card_material.node_tree.nodes:
+        if node.bl_idname == 'ShaderNodeTexImage' and node.image and node.image.name in baked:
+            node.image = baked[node.image.name]
+        elif node.bl_idname == 'ShaderNodeAttribute' and node.attribute_type == 'INSTANCER':
+            # Instance attributes are copied onto the card faces
+            node.attribute_type = 'GEOMETRY'
+    return card_material
+
+
+def _split_clusters(positions, size):
+    """Splits leaves at the median of their longest axis until clusters hold at most size leaves."""
+    stack = [np.arange(len(positions))]
+    clusters = []
+    while stack:
+        indices = stack.pop()
+        if len(indices) <= size:
+            clusters.append(indices)
+            continue
+        points = positions[indices]
+        axis = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+        ordered = indices[np.argsort(points[:, axis], kind='stable')]
+        half = len(ordered) // 2
+        stack += [ordered[half:], ordered[:half]]
+    return clusters
+
+
+def build_leaf_cards(plant, scene, depsgraph):
+    """
+    Replaces the leaf instances of a plant with alpha-textured cluster cards.
+    Returns (leaf triangles, card triangles), or None if the plant has no
+    textured leaves.
+    """
+    geometry = plant.evaluated_get(depsgraph).evaluated_geometry()
+    instances = geometry.instances_pointcloud()
+    if instances is None or len(instances.points) == 0:
+        return None
+
+    count = len(instances.points)
+    transforms = np.empty(count * 16, dtype=np.float32)
+    instances.attributes["instance_transform"].data.foreach_get("value", transforms)
+    # Matrices are stored column by column: translation is the last column
+    transforms = transforms.reshape(count, 4, 4)
+    positions = transforms[:, 3, :3].astype(np.float64)
+    sizes = np.linalg.norm(transforms[:, 0, :3], axis=1)
+    reference_index = np.empty(count, dtype=np.int32)
+    instances.attributes[".reference_index"].data.foreach_get("value", reference_index)
+    references = geometry.instance_references()
+
+    materials = [_material_of(reference) for reference in references]
+    if not any(materials):
+        return None
+    leaf_triangles = int(sum(_triangles_of(references[i]) for i in reference_index))
+
+    # Each card is a quad spanned by two principal axes of its cluster
+    corners, faces_material, face_clusters = [], [], []
+    card_materials = []
+    for cluster in _split_clusters(positions, scene.leaf_card_leaves):
+        points = positions[cluster]
+        center = points.mean(axis=0)
+        if len(cluster) > 2:
+            _values, axes = np.linalg.eigh(np.cov((points - center).T))
+        else:
+            axes = np.eye(3)
+        margin = sizes[cluster].mean() * 0.5
+        extents = np.abs((points - center) @ axes).max(axis=0) + margin
+        extents *= scene.leaf_card_silhouette
+        normal_axis, minor, major = axes.T
+        planes = [(major * extents[2], minor * max(extents[1], margin))]
+        if scene.leaf_card_crossed:
+            planes.append((major * extents[2], normal_axis * max(extents[1], margin)))
+
+        material = materials[np.bincount(reference_index[cluster]).argmax()] or next(m for m in materials if m)
+        if material not in card_materials:
+            card_materials.append(material)
+        for width, height in planes:
+            corners += [center - width - height, center + width - height, center + width + height, center - width + height]
+            faces_material.append(card_materials.index(material))
+            face_clusters.append(cluster)
+
+    n_faces = len(faces_material)
+    mesh = bpy.data.meshes.new(f"{plant.name} Leaf Cards")
+    mesh.vertices.add(n_faces * 4)
+    mesh.vertices.foreach_set("co", np.array(corners, dtype=np.float32).ravel())
+    mesh.loops.add(n_faces * 4)
+    mesh.loops.foreach_set("vertex_index", np.arange(n_faces * 4, dtype=np.int32))
+    mesh.polygons.add(n_faces)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, n_faces * 4, 4, dtype=np.int32))
+    mesh.polygons.foreach_set("material_index", np.array(faces_material, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", np.tile(np.array([0, 0, 1, 0, 1, 1, 0, 1], dtype=np.float32), n_faces))
+    for material in card_materials:
+        mesh.materials.append(get_card_material(material, scene.leaf_card_resolution, scene.leaf_card_density))
+
+    # Carry averaged instance attributes (season colors, wind weights...) onto the cards
+    for name in instances.attributes.keys():
+        attribute = instances.attributes[name]
+        if name.startswith(".") or name == "instance_transform" or attribute.data_type not in ('FLOAT', 'FLOAT2', 'FLOAT_VECTOR', 'FLOAT_COLOR'):
+            continue
+        key, components, _dtype = ATTRIBUTE_LAYOUT[attribute.data_type]
+        values = np.empty(count * components, dtype=np.float32)
+        attribute.data.foreach_get(key, values)
+        values = values.reshape(count, components)
+        averaged = np.array([values[cluster].mean(axis=0) for cluster in face_clusters], dtype=np.float32)
+        mesh.attributes.new(name, attribute.data_type, 'FACE').data.foreach_set(key, averaged.ravel())
+
+    for child in list(plant.children):
+        if LEAF_CARDS_KEY in child:
+            bpy.data.objects.remove(child)
+    cards = bpy.data.objects.new(f"{plant.name} Leaf Cards", mesh)
+    for collection in plant.users_collection:
+        collection.objects.link(cards)
+    cards.parent = plant
+    cards[LEAF_CARDS_KEY] = True
+
+    get_generator_modifier(plant)[SOCKET["showLeaves"]] = False
+    plant.update_tag()
+    return leaf_triangles, n_faces * 2
+
+
+class ROOTED_OT_BuildLeafCards(bpy.types.Operator):
+    bl_idname = "rooted.build_leaf_cards"
+    bl_label = "Build Leaf Cards"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Replace the leaves of the selected plants with textured cluster cards"
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_rooted_objects(context.selected_objects))
+
+    def execute(self, context):
+        plants = get_rooted_objects(context.selected_objects)
+
+        # Plants that already have cards hide their leaves, bring them back to rebuild
+        hidden = []
+        for plant in plants:
+            mod = get_generator_modifier(plant)
+            if not mod.get(SOCKET["showLeaves"], True):
+                mod[SOCKET["showLeaves"]] = True
+                plant.update_tag()
+                hidden.append(plant)
+        depsgraph = context.evaluated_depsgraph_get()
+        depsgraph.update()
+
+        leaf_triangles = card_triangles = 0
+        for plant in plants:
+            result = build_leaf_cards(plant, context.scene, depsgraph)
+            if result is None:
+                if plant in hidden:
+                    get_generator_modifier(plant)[SOCKET["showLeaves"]] = False
+                    plant.update_tag()
+                self.report({'WARNING'}, f"{plant.name} has no textured leaves, skipped")
+                continue
+            leaf_triangles += result[0]
+            card_triangles += result[1]
+        context.view_layer.update()
+
+        if card_triangles:
+            self.report({'INFO'}, f"Reduced {leaf_triangles} leaf triangles to {card_triangles} ({leaf_triangles / card_triangles:.1f}x fewer)")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+class ROOTED_OT_RemoveLeafCards(bpy.types.Operator):
+    bl_idname = "rooted.remove_leaf_cards"
+    bl_label = "Remove Leaf Cards"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Remove the leaf cards of the selected plants and show their leaves again"
+
+    def execute(self, context):
+        removed = 0
+        for plant in get_rooted_objects(context.selected_objects):
+            cards = [child for child in plant.children if LEAF_CARDS_KEY in child]
+            if not cards:
+                # Leave plants alone whose leaves the user hid without cards
+                continue
+            for child in cards:
+                bpy.data.objects.remove(child)
+            removed += 1
+            get_generator_modifier(plant)[SOCKET["showLeaves"]] = True
+            plant.update_tag()
+        context.view_layer.update()
+
+        self.report({'INFO'}, f"Removed leaf cards from {removed} plant(s)")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+classes = [ROOTED_OT_BuildLeafCards, ROOTED_OT_RemoveLeafCards]
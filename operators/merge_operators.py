@@ -0,0 +1,338 @@
+import bpy
+import math
+import bmesh
+
+import numpy as np
+from .fingerprint_operators import ATTRIBUTE_LAYOUT
+from .bake_operators import BAKED_KEY
+from .leaf_card_operators import LEAF_CARDS_KEY
+from .tile_operators import TILE_KEY, TILE_SIZE_KEY, find_layer_collection, get_tiles_root
+
+
+MERGED_KEY = "rooted_merged"
+PLANTS_KEY = "rooted_merged_plants"
+ORIGIN_KEY = "rooted_merged_from"
+PLANT_ATTRIBUTE = "rooted_plant"
+SOURCES_NAME = "Rooted Merged Sources"
+
+
+def get_sources_collection(context):
+    """
+    Returns the collection merged plants are parked in. It is excluded from
+    the view layer, so parked plants cost nothing in the depsgraph.
+    """
+    sources = bpy.data.collections.get(SOURCES_NAME)
+    if sources is None:
+        sources = bpy.data.collections.new(SOURCES_NAME)
+        context.scene.collection.children.link(sources)
+    layer = find_layer_collection(context.view_layer.layer_collection, sources)
+    if layer is not None:
+        layer.exclude = True
+    return sources
+
+
+def _read(attribute):
+    key, components, dtype = ATTRIBUTE_LAYOUT[attribute.data_type]
+    values = np.empty(len(attribute.data) * components, dtype=dtype)
+    attribute.data.foreach_get(key, values)
+    return values.reshape(-1, components)
+
+
+def mesh_parts(mesh):
+    """
+    Splits a mesh into one part per material slot, as flat arrays read with
+    foreach_get: positions, corner vertices, face sizes and the point, face
+    and corner attributes.
+    """
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    corner_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", corner_verts)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    material_index = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_index)
+
+    attributes = {}
+    for attribute in mesh.attributes:
+        if attribute.name.startswith(".") or attribute.name in {"position", "material_index"}:
+            continue
+        if attribute.domain not in {'POINT', 'FACE', 'CORNER'} or attribute.data_type not in ATTRIBUTE_LAYOUT:
+            continue
+        attributes[(attribute.name, attribute.data_type, attribute.domain)] = _read(attribute)
+
+    parts = {}
+    for slot in np.unique(material_index):
+        face_mask = material_index == slot
+        corner_mask = np.repeat(face_mask, loop_totals)
+        verts, remapped = np.unique(corner_verts[corner_mask], return_inverse=True)
+        masks = {'POINT': verts, 'FACE': face_mask, 'CORNER': corner_mask}
+        parts[int(slot)] = {
+            "co": co[verts],
+            "corner_verts": remapped.astype(np.int32),
+            "loop_totals": loop_totals[face_mask],
+            "attributes": {key: values[masks[key[2]]] for key, values in attributes.items()},
+        }
+    return parts
+
+
+# Attribute types that widen losslessly into the later types of their family
+TYPE_PROMOTION = (('BOOLEAN', 'INT8', 'INT', 'FLOAT'), ('BYTE_COLOR', 'FLOAT_COLOR'))
+
+
+def _common_type(data_types):
+    if len(data_types) == 1:
+        return next(iter(data_types))
+    for family in TYPE_PROMOTION:
+        if data_types <= set(family):
+            return max(data_types, key=family.index)
+    return None
+
+
+def _to_domain(part, values, domain, target):
+    if domain == target:
+        return values
+    if domain == 'POINT':
+        return values[part["corner_verts"]]
+    # Face values repeat on each corner of the face
+    return np.repeat(values, part["loop_totals"], axis=0)
+
+
+def build_merged_mesh(name, pieces):
+    """
+    Concatenates (part, matrix, plant index) pieces into one mesh with
+    foreach_set. Faces get a rooted_plant attribute naming their plant.
+    Returns the mesh and the names of attributes that could not be merged
+    (missing from some pieces, or with incompatible types).
+    """
+    co, corner_verts, loop_totals, plant_ids = [], [], [], []
+    offset = 0
+    for part, matrix, plant_index in pieces:
+        co.append(part["co"] @ matrix[:3, :3].T + matrix[:3, 3])
+        corner_verts.append(part["corner_verts"] + offset)
+        loop_totals.append(part["loop_totals"])
+        plant_ids.append(np.full(len(part["loop_totals"]), plant_index, dtype=np.int32))
+        offset += len(part["co"])
+
+    co = np.concatenate(co).astype(np.float32)
+    corner_verts = np.concatenate(corner_verts)
+    loop_totals = np.concatenate(loop_totals)
+    loop_starts = np.concatenate([[0], np.cumsum(loop_totals)[:-1]]).astype(np.int32)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.loops.add(len(corner_verts))
+    mesh.loops.foreach_set("vertex_index", corner_verts)
+    mesh.polygons.add(len(loop_totals))
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    mesh.update(calc_edges=True)
+
+    # Baking compacts every mesh on its own, so pieces may store the same
+    # attribute with different types or domains: widen them to a common one
+    layouts = {}
+    for part, _matrix, _index in pieces:
+        for attribute_name, data_type, domain in part["attributes"]:
+            layouts.setdefault(attribute_name, set()).add((data_type, domain))
+
+    dropped = set()
+    for attribute_name, variants in sorted(layouts.items()):
+        data_type = _common_type({variant[0] for variant in variants})
+        domains = {variant[1] for variant in variants}
+        domain = domains.pop() if len(domains) == 1 else 'CORNER'
+        chunks = []
+        for part, _matrix, _index in pieces:
+            key = next((key for key in part["attributes"] if key[0] == attribute_name), None)
+            if data_type is None or key is None:
+                break
+            chunks.append(_to_domain(part, part["attributes"][key], key[2], domain))
+        else:
+            foreach_key, _components, dtype = ATTRIBUTE_LAYOUT[data_type]
+            values = np.concatenate(chunks)
+            mesh.attributes.new(attribute_name, data_type, domain).data.foreach_set(foreach_key, values.astype(dtype).ravel())
+            continue
+        dropped.add(attribute_name)
+    mesh.attributes.new(PLANT_ATTRIBUTE, 'INT', 'FACE').data.foreach_set("value", np.concatenate(plant_ids))
+    return mesh, dropped
+
+
+def merge_plants(context, plants):
+    """
+    Joins baked plants, with their leaf cards, into one mesh per tile and
+    material, in tile collections under 'Rooted Tiles'. Plants are parked
+    in the excluded sources collection, and each tile collection records
+    their names so they can be split back out.
+    Returns the number of merged objects and the names of the attributes
+    that had to be dropped.
+    """
+    scene = context.scene
+    root = get_tiles_root(scene)
+    size = root.get(TILE_SIZE_KEY, scene.tile_size)
+    sources = get_sources_collection(context)
+    parts_cache = {}
+    groups = {}
+    dropped = set()
+    tiles = {}
+
+    for plant in plants:
+        location = plant.matrix_world.translation
+        ix, iy = math.floor(location.x / size), math.floor(location.y / size)
+        tile = tiles.get((ix, iy))
+        if tile is None:
+            name = f"Rooted Merged {ix}_{iy}"
+            tile = bpy.data.collections.get(name)
+            if tile is None:
+                # Merged tiles live with the streaming tiles, so they are excluded when far
+                tile = bpy.data.collections.new(name)
+                tile[TILE_KEY] = (ix, iy)
+                root.children.link(tile)
+            tiles[(ix, iy)] = tile
+
+        names = list(tile.get(PLANTS_KEY, []))
+        plant_index = len(names)
+        names.append(plant.name)
+        tile[PLANTS_KEY] = names
+
+        # Leaf cards replace the plant's foliage, so they are merged along with it
+        origin = np.array(((ix + 0.5) * size, (iy + 0.5) * size, 0.0), dtype=np.float32)
+        cards = [child for child in plant.children if LEAF_CARDS_KEY in child and child.type == 'MESH']
+        for obj in [plant, *cards]:
+            if obj.data.name not in parts_cache:
+                parts_cache[obj.data.name] = mesh_parts(obj.data)
+            matrix = np.array(obj.matrix_world, dtype=np.float32)
+            matrix[:3, 3] -= origin
+            for slot, part in parts_cache[obj.data.name].items():
+                material = obj.material_slots[slot].material if slot < len(obj.material_slots) else None
+                groups.setdefault((ix, iy, material), []).append((part, matrix, plant_index))
+
+        # Park the plant and everything attached to it
+        for obj in [plant, *plant.children_recursive]:
+            obj[ORIGIN_KEY] = [collection.name for collection in obj.users_collection]
+            for collection in list(obj.users_collection):
+                collection.objects.unlink(obj)
+            sources.objects.link(obj)
+
+    for (ix, iy, material), pieces in groups.items():
+        material_name = material.name if material else "None"
+        mesh, lost = build_merged_mesh(f"Rooted Merged {ix}_{iy} {material_name}", pieces)
+        dropped |= lost
+        if material is not None:
+            mesh.materials.append(material)
+        obj = bpy.data.objects.new(mesh.name, mesh)
+        obj.location = ((ix + 0.5) * size, (iy + 0.5) * size, 0.0)
+        obj[MERGED_KEY] = True
+        tiles[(ix, iy)].objects.link(obj)
+    return len(groups), dropped
+
+
+def split_plants(context, tile, plant_indices):
+    """
+    Moves the given plants of a merged tile back to their collections and
+    removes their faces from the tile's merged meshes.
+    """
+    names = list(tile[PLANTS_KEY])
+    sources = bpy.data.collections.get(SOURCES_NAME)
+
+    for merged in list(tile.objects):
+        if MERGED_KEY not in merged:
+            continue
+        bm = bmesh.new()
+        bm.from_mesh(merged.data)
+        layer = bm.faces.layers.int.get(PLANT_ATTRIBUTE)
+        if layer is not None:
+            faces = [face for face in bm.faces if face[layer] in plant_indices]
+            bmesh.ops.delete(bm, geom=faces, context='FACES')
+            bm.to_mesh(merged.data)
+        bm.free()
+        if not merged.data.polygons:
+            mesh = merged.data
+            bpy.data.objects.remove(merged)
+            bpy.data.meshes.remove(mesh)
+
+    for index in plant_indices:
+        plant = bpy.data.objects.get(names[index])
+        names[index] = ""
+        if plant is None:
+            continue
+        for obj in [plant, *plant.children_recursive]:
+            if sources is not None and obj.name in sources.objects:
+                sources.objects.unlink(obj)
+            targets = [bpy.data.collections.get(name) for name in obj.get(ORIGIN_KEY, [])]
+            targets = [collection for collection in targets if collection is not None] or [context.scene.collection]
+            for collection in targets:
+                if obj.name not in collection.objects:
+                    collection.objects.link(obj)
+            obj.pop(ORIGIN_KEY, None)
+
+    tile[PLANTS_KEY] = names
+    if not any(names):
+        bpy.data.collections.remove(tile)
+
+
+class ROOTED_OT_MergePlants(bpy.types.Operator):
+    bl_idname = "rooted.merge_plants"
+    bl_label = "Merge Plants"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Join the selected baked plants into one mesh per tile and material"
+
+    def execute(self, context):
+        plants = [obj for obj in context.selected_objects if BAKED_KEY in obj and obj.type == 'MESH']
+        if not plants:
+            self.report({'ERROR'}, "Select baked plants to merge")
+            return {'CANCELLED'}
+
+        count, dropped = merge_plants(context, plants)
+        if dropped:
+            self.report({'WARNING'}, f"Attributes not shared by all merged plants were dropped: {', '.join(sorted(dropped))}")
+
+        self.report({'INFO'}, f"Merged {len(plants)} plant(s) into {count} object(s)")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+class ROOTED_OT_SplitPlants(bpy.types.Operator):
+    bl_idname = "rooted.split_plants"
+    bl_label = "Split Plants"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Split plants back out of the selected merged meshes (only those under selected faces in Edit Mode)"
+
+    def execute(self, context):
+        merged = [obj for obj in context.selected_objects if MERGED_KEY in obj]
+        if not merged:
+            self.report({'ERROR'}, "Select merged plant meshes to split")
+            return {'CANCELLED'}
+
+        # Faces selected in Edit Mode pick single plants, otherwise whole tiles split
+        edit_mode = context.mode == 'EDIT_MESH'
+        if edit_mode:
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        requests = {}
+        for obj in merged:
+            tile = next((collection for collection in obj.users_collection if PLANTS_KEY in collection), None)
+            if tile is None:
+                continue
+            plant_ids = np.empty(len(obj.data.polygons), dtype=np.int32)
+            obj.data.attributes[PLANT_ATTRIBUTE].data.foreach_get("value", plant_ids)
+            if edit_mode:
+                selected = np.empty(len(obj.data.polygons), dtype=bool)
+                obj.data.polygons.foreach_get("select", selected)
+                plant_ids = plant_ids[selected]
+            requests.setdefault(tile.name, set()).update(int(index) for index in np.unique(plant_ids))
+
+        count = 0
+        for tile_name, plant_indices in requests.items():
+            split_plants(context, bpy.data.collections[tile_name], plant_indices)
+            count += len(plant_indices)
+
+        self.report({'INFO'}, f"Split {count} plant(s) back out")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+classes = [ROOTED_OT_MergePlants, ROOTED_OT_SplitPlants]
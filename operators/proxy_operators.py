@@ -0,0 +1,182 @@
+import bpy
+import bmesh
+
+import numpy as np
+from mathutils import Matrix, Vector
+from . import get_generator_modifier, get_rooted_objects
+from .tree_operators import SOCKET
+from .skeleton_operators import evaluate_skeletons
+
+
+COLLISION_KEY = "rooted_collision"
+
+# Offsets that turn a point into a small octahedron, giving hulls volume
+_OCTAHEDRON = np.array([(1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)], dtype=np.float32)
+
+
+def cluster_points(points, count, iterations=10):
+    """
+    Groups points into at most count clusters with k-means. Seeding uses
+    farthest-point sampling from the first point, so the result only
+    depends on the input order and is reproducible.
+    """
+    count = min(count, len(points))
+    centers = [points[0]]
+    dist = np.linalg.norm(points - points[0], axis=1)
+    for _ in range(1, count):
+        centers.append(points[np.argmax(dist)])
+        dist = np.minimum(dist, np.linalg.norm(points - centers[-1], axis=1))
+    centers = np.array(centers, dtype=np.float64)
+
+    labels = np.zeros(len(points), dtype=np.int64)
+    for _ in range(iterations):
+        labels = np.argmin(((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2), axis=1)
+        for cluster in range(count):
+            members = points[labels == cluster]
+            if len(members):
+                centers[cluster] = members.mean(axis=0)
+    return labels
+
+
+def _capsule_bmesh(start, end, radius):
+    axis = Vector(end) - Vector(start)
+    bm = bmesh.new()
+    # An odd ring count keeps a band across the equator to stretch into the cylinder
+    bmesh.ops.create_uvsphere(bm, u_segments=8, v_segments=7, radius=radius)
+    for vert in bm.verts:
+        if vert.co.z > 0.0:
+            vert.co.z += axis.length
+    rotation = axis.to_track_quat('Z', 'Y').to_matrix().to_4x4()
+    bmesh.ops.transform(bm, matrix=Matrix.Translation(start) @ rotation, verts=bm.verts)
+    return bm
+
+
+def _hull_bmesh(points, margins):
+    bm = bmesh.new()
+    inflated = (points[:, None, :] + _OCTAHEDRON[None, :, :] * np.reshape(margins, (-1, 1, 1))).reshape(-1, 3)
+    for co in inflated:
+        bm.verts.new(co)
+    result = bmesh.ops.convex_hull(bm, input=bm.verts)
+    unused = [v for v in result["geom_interior"] + result["geom_unused"] if isinstance(v, bmesh.types.BMVert)]
+    bmesh.ops.delete(bm, geom=unused, context='VERTS')
+    return bm
+
+
+def _link_proxy(plant, name, shape, bm):
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    obj = bpy.data.objects.new(name, mesh)
+    for collection in plant.users_collection:
+        collection.objects.link(obj)
+    obj.parent = plant
+    obj.display_type = 'WIRE'
+    obj.hide_render = True
+    obj[COLLISION_KEY] = shape
+    return obj
+
+
+def build_collision_proxies(plant, skeleton, scene):
+    """
+    Builds collision proxies for a plant from its skeleton: capsules or hulls
+    along the trunk and first-level branches, and a few convex volumes
+    around the foliage. Objects follow the UCP_/UCX_ naming used by game
+    engines to recognise capsule and convex collision.
+    """
+    for child in list(plant.children):
+        if COLLISION_KEY in child:
+            bpy.data.objects.remove(child)
+
+    points = skeleton["points"].astype(np.float64)
+    radii = skeleton["radii"]
+    levels = skeleton["levels"]
+    starts = skeleton["offsets"][:-1]
+    ends = skeleton["offsets"][1:]
+
+    proxies = []
+    for start, end in zip(starts, ends):
+        if levels[start] > 1 or end - start < 2:
+            continue
+        # Split each branch into straight pieces that follow its curvature
+        bounds = np.linspace(start, end - 1, scene.proxy_segments + 1).round().astype(int)
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            if last <= first:
+                continue
+            index = len(proxies)
+            if scene.proxy_branch_shape == 'CAPSULE':
+                radius = float(radii[first:last + 1].mean())
+                bm = _capsule_bmesh(points[first], points[last], radius)
+                proxies.append(_link_proxy(plant, f"UCP_{plant.name}_{index:02d}", 'CAPSULE', bm))
+            else:
+                bm = _hull_bmesh(points[first:last + 1], radii[first:last + 1])
+                proxies.append(_link_proxy(plant, f"UCX_{plant.name}_{index:02d}", 'HULL', bm))
+
+    # Leaves hang off the outermost branch levels
+    mod = get_generator_modifier(plant)
+    if mod.get(SOCKET["addLeaves"], True) and scene.proxy_foliage_volumes > 0 and levels.max() >= 2:
+        foliage = points[levels >= max(2, int(levels.max()) - 1)]
+        labels = cluster_points(foliage, scene.proxy_foliage_volumes)
+        for cluster in np.unique(labels):
+            index = len(proxies)
+            bm = _hull_bmesh(foliage[labels == cluster], scene.proxy_foliage_margin)
+            proxies.append(_link_proxy(plant, f"UCX_{plant.name}_{index:02d}", 'FOLIAGE', bm))
+
+    return proxies
+
+
+class ROOTED_OT_AddCollisionProxies(bpy.types.Operator):
+    bl_idname = "rooted.add_collision_proxies"
+    bl_label = "Add Collision Proxies"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Add simplified collision shapes derived from the branch structure of the selected plants"
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_rooted_objects(context.selected_objects))
+
+    def execute(self, context):
+        plants = get_rooted_objects(context.selected_objects)
+        try:
+            skeletons = evaluate_skeletons(context, plants)
+        except RuntimeError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        count = 0
+        for plant, skeleton in zip(plants, skeletons):
+            if skeleton is None:
+                self.report({'WARNING'}, f"{plant.name} has no branch curves, skipped")
+                continue
+            count += len(build_collision_proxies(plant, skeleton, context.scene))
+            if skeleton["orphans"]:
+                self.report({'WARNING'}, f"{plant.name}: {skeleton['orphans']} branch(es) could not be attached and count as trunks")
+
+        self.report({'INFO'}, f"Added {count} collision proxies")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+class ROOTED_OT_RemoveCollisionProxies(bpy.types.Operator):
+    bl_idname = "rooted.remove_collision_proxies"
+    bl_label = "Remove Collision Proxies"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Remove the collision proxies of the selected plants"
+
+    def execute(self, context):
+        removed = 0
+        for plant in get_rooted_objects(context.selected_objects):
+            for child in list(plant.children):
+                if COLLISION_KEY in child:
+                    bpy.data.objects.remove(child)
+                    removed += 1
+
+        self.report({'INFO'}, f"Removed {removed} collision proxies")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+classes = [ROOTED_OT_AddCollisionProxies, ROOTED_OT_RemoveCollisionProxies]
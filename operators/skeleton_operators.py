@@ -0,0 +1,240 @@
+import bpy
+import time
+
+import numpy as np
+from mathutils import kdtree
+from bpy_extras.io_utils import ExportHelper
+from . import GENERATOR_NAME, get_generator_modifier, get_rooted_objects
+from .tree_operators import SOCKET
+
+
+SKELETON_NAME = "Simple Tree Generator Skeleton"
+
+
+def _strip_meshing(tree):
+    """
+    Bypasses every Curve to Mesh node in a node tree (and in copies of its
+    nested groups) so the branch curves reach the output unmeshed.
+    Returns True if anything was bypassed.
+    """
+    changed = False
+    for node in list(tree.nodes):
+        if node.bl_idname == 'GeometryNodeCurveToMesh':
+            curve = node.inputs["Curve"]
+            if curve.is_linked:
+                source = curve.links[0].from_socket
+                for link in list(node.outputs["Mesh"].links):
+                    tree.links.new(source, link.to_socket)
+            tree.nodes.remove(node)
+            changed = True
+        elif node.bl_idname == 'GeometryNodeGroup' and node.node_tree is not None:
+            nested = node.node_tree.copy()
+            if _strip_meshing(nested):
+                node.node_tree = nested
+                changed = True
+            else:
+                bpy.data.node_groups.remove(nested)
+    return changed
+
+
+def get_skeleton_group():
+    """
+    Returns the skeleton variant of the generator: the same node group with
+    the tube meshing bypassed, so it outputs the bare branch curves.
+    """
+    group = bpy.data.node_groups.get(SKELETON_NAME)
+    if group is not None:
+        return group
+
+    generator = bpy.data.node_groups.get(GENERATOR_NAME)
+    if generator is None:
+        return None
+    group = generator.copy()
+    group.name = SKELETON_NAME
+    if not _strip_meshing(group):
+        bpy.data.node_groups.remove(group)
+        return None
+    return group
+
+
+def _branch_structure(points, offsets):
+    """
+    Derives parent indices and branch levels from a set of branch curves.
+
+    Inside a curve each point's parent is the previous point. The first
+    point of a curve is attached to the nearest non-starting point of
+    another curve; the curve starting lowest is the trunk (level 0).
+    Returns parents, levels and the number of curves left without a parent.
+    """
+    n_points = len(points)
+    n_curves = len(offsets) - 1
+    starts = offsets[:-1]
+    curve_of_point = np.repeat(np.arange(n_curves), np.diff(offsets))
+
+    parents = np.arange(n_points, dtype=np.int32) - 1
+    parents[starts] = -1
+    levels = np.zeros(n_points, dtype=np.uint8)
+    if n_curves == 0:
+        return parents, levels, 0
+
+    root = int(np.argmin(points[starts, 2]))
+    is_start = np.zeros(n_points, dtype=bool)
+    is_start[starts] = True
+    candidates = np.flatnonzero(~is_start)
+
+    parent_curve = np.full(n_curves, -1, dtype=np.int64)
+    if len(candidates):
+        tree = kdtree.KDTree(len(candidates))
+        for index in candidates:
+            tree.insert(points[index], int(index))
+        tree.balance()
+        for curve in range(n_curves):
+            if curve == root:
+                continue
+            # Dense curves can fill the nearest points, so widen until another curve shows up
+            n = 8
+            while True:
+                nearest = tree.find_n(points[starts[curve]], n)
+                index = next((index for _co, index, _dist in nearest if curve_of_point[index] != curve), None)
+                if index is not None or n >= len(candidates):
+                    break
+                n *= 2
+            if index is not None:
+                parents[starts[curve]] = index
+                parent_curve[curve] = curve_of_point[index]
+
+    curve_levels = np.full(n_curves, -1, dtype=np.int64)
+    curve_levels[root] = 0
+    for curve in range(n_curves):
+        # Walk up to a curve with a known level; orphans and cycles start over at 0
+        chain, ancestor = [], curve
+        while ancestor != -1 and curve_levels[ancestor] == -1 and ancestor not in chain:
+            chain.append(ancestor)
+            ancestor = parent_curve[ancestor]
+        level = curve_levels[ancestor] if ancestor != -1 and curve_levels[ancestor] != -1 else -1
+        for link in reversed(chain):
+            level += 1
+            curve_levels[link] = level
+    levels = np.clip(curve_levels, 0, 255).astype(np.uint8)[curve_of_point]
+    orphans = int(np.count_nonzero(parent_curve == -1)) - 1
+    return parents, levels, orphans
+
+
+def evaluate_skeletons(context, plants):
+    """
+    Evaluates only the branch curves of the given plants, without leaves or
+    tube meshing. Returns one dict per plant with flat arrays in the plant's
+    local space: points (N, 3), parents (N,), radii (N,), levels (N,), the
+    curve offsets (C + 1,) and the number of orphan branches, or None for plants whose generator produced no curves.
+    """
+    group = get_skeleton_group()
+    if group is None:
+        raise RuntimeError(f"Could not build a skeleton variant of '{GENERATOR_NAME}'")
+
+    # Evaluate stand-ins so the plants themselves are never re-evaluated
+    proxies = []
+    for plant in plants:
+        proxy = bpy.data.objects.new(f"{plant.name} Skeleton", plant.data)
+        context.scene.collection.objects.link(proxy)
+        mod = get_generator_modifier(plant)
+        skeleton = proxy.modifiers.new(name="Skeleton", type='NODES')
+        skeleton.node_group = group
+        for key in mod.keys():
+            skeleton[key] = mod[key]
+        skeleton[SOCKET["addLeaves"]] = False
+        skeleton[SOCKET["showLeaves"]] = False
+        proxies.append(proxy)
+
+    results = []
+    try:
+        depsgraph = context.evaluated_depsgraph_get()
+        depsgraph.update()
+        for proxy in proxies:
+            curves = proxy.evaluated_get(depsgraph).evaluated_geometry().curves
+            if curves is None or len(curves.points) == 0:
+                results.append(None)
+                continue
+
+            n_points = len(curves.points)
+            points = np.empty(n_points * 3, dtype=np.float32)
+            curves.attributes["position"].data.foreach_get("vector", points)
+            points = points.reshape(n_points, 3)
+
+            radii = np.ones(n_points, dtype=np.float32)
+            if "radius" in curves.attributes:
+                curves.attributes["radius"].data.foreach_get("value", radii)
+
+            offsets = np.empty(len(curves.curves) + 1, dtype=np.int32)
+            curves.curve_offset_data.foreach_get("value", offsets)
+
+            parents, levels, orphans = _branch_structure(points, offsets)
+            results.append({"points": points, "parents": parents, "radii": radii, "levels": levels,
+                            "offsets": offsets, "orphans": orphans})
+    finally:
+        for proxy in proxies:
+            bpy.data.objects.remove(proxy)
+
+    return results
+
+
+class ROOTED_OT_ExportSkeleton(bpy.types.Operator, ExportHelper):
+    bl_idname = "rooted.export_skeleton"
+    bl_label = "Export Skeleton"
+    bl_options = {'REGISTER'}
+    bl_description = "Export the branch graph of the selected plants as flat NumPy arrays (.npz)"
+
+    filename_ext = ".npz"
+    filter_glob: bpy.props.StringProperty(default="*.npz", options={'HIDDEN'})
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_rooted_objects(context.selected_objects))
+
+    def execute(self, context):
+        plants = get_rooted_objects(context.selected_objects)
+        start = time.perf_counter()
+        try:
+            skeletons = evaluate_skeletons(context, plants)
+        except RuntimeError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        # Concatenate all plants in world space; parents index the global arrays
+        points, parents, radii, levels, names, offsets = [], [], [], [], [], [0]
+        for plant, skeleton in zip(plants, skeletons):
+            if skeleton is None:
+                self.report({'WARNING'}, f"{plant.name} has no branch curves, skipped")
+                continue
+            matrix = np.array(plant.matrix_world, dtype=np.float32)
+            scale = max(plant.matrix_world.to_scale())
+            local_parents = skeleton["parents"]
+            points.append(skeleton["points"] @ matrix[:3, :3].T + matrix[:3, 3])
+            parents.append(np.where(local_parents < 0, -1, local_parents + offsets[-1]).astype(np.int32))
+            radii.append(skeleton["radii"] * scale)
+            levels.append(skeleton["levels"])
+            names.append(plant.name)
+            offsets.append(offsets[-1] + len(local_parents))
+
+        orphans = sum(skeleton["orphans"] for skeleton in skeletons if skeleton is not None)
+        if orphans:
+            self.report({'WARNING'}, f"{orphans} branch(es) could not be attached and were exported as roots")
+
+        if not names:
+            self.report({'ERROR'}, "No branch curves to export")
+            return {'CANCELLED'}
+
+        np.savez_compressed(
+            self.filepath,
+            points=np.concatenate(points).astype(np.float32),
+            parents=np.concatenate(parents),
+            radii=np.concatenate(radii).astype(np.float32),
+            levels=np.concatenate(levels),
+            plant_offsets=np.array(offsets, dtype=np.int64),
+            plant_names=np.array(names),
+        )
+
+        self.report({'INFO'}, f"Exported {len(names)} skeleton(s), {offsets[-1]} points in {time.perf_counter() - start:.2f}s")
+        return {'FINISHED'}
+
+
+classes = [ROOTED_OT_ExportSkeleton]
@@ -0,0 +1,208 @@
+import bpy
+import math
+from bpy.app.handlers import persistent
+from . import get_rooted_objects, get_view_location
+
+
+TILES_NAME = "Rooted Tiles"
+TILE_KEY = "rooted_tile"
+TILE_SIZE_KEY = "rooted_tile_size"
+FAR_KEY = "rooted_tile_far"
+DISPLAY_KEY = "rooted_display_type"
+
+# Seconds between checks of the view while streaming
+STREAM_INTERVAL = 0.5
+
+_last_view = None
+
+
+def find_layer_collection(layer, collection):
+    """Returns the layer collection of a collection inside a view layer tree."""
+    if layer.collection == collection:
+        return layer
+    for child in layer.children:
+        found = find_layer_collection(child, collection)
+        if found is not None:
+            return found
+    return None
+
+
+def get_tiles_root(scene):
+    """Returns the 'Rooted Tiles' collection, creating it with the current tile size if needed."""
+    root = bpy.data.collections.get(TILES_NAME)
+    if root is None:
+        root = bpy.data.collections.new(TILES_NAME)
+        scene.collection.children.link(root)
+        root[TILE_SIZE_KEY] = scene.tile_size
+    return root
+
+
+def build_tiles(context):
+    """
+    Sorts all Rooted plants, with their impostor and collision children,
+    into one collection per grid cell under the 'Rooted Tiles' collection.
+    Returns the number of tiles.
+    """
+    scene = context.scene
+    size = scene.tile_size
+    root = get_tiles_root(scene)
+    root[TILE_SIZE_KEY] = size
+
+    scene_collections = {scene.collection, *scene.collection.children_recursive}
+    for plant in get_rooted_objects(scene.objects):
+        location = plant.matrix_world.translation
+        ix, iy = math.floor(location.x / size), math.floor(location.y / size)
+        name = f"Rooted Tile {ix}_{iy}"
+        tile = root.children.get(name)
+        if tile is None:
+            tile = bpy.data.collections.new(name)
+            tile[TILE_KEY] = (ix, iy)
+            root.children.link(tile)
+
+        for obj in [plant, *plant.children_recursive]:
+            if tile in obj.users_collection:
+                continue
+            # Leave collections of other scenes alone
+            for collection in list(obj.users_collection):
+                if collection in scene_collections:
+                    collection.objects.unlink(obj)
+            tile.objects.link(obj)
+            # Match the display of the new tile, not the one the object left
+            _set_object_bounds(obj, tile.get(FAR_KEY, False))
+
+    for tile in list(root.children):
+        if TILE_KEY in tile and not tile.all_objects:
+            bpy.data.collections.remove(tile)
+    return len(root.children)
+
+
+def _set_object_bounds(obj, far):
+    if far and DISPLAY_KEY not in obj:
+        obj[DISPLAY_KEY] = obj.display_type
+        obj.display_type = 'BOUNDS'
+    elif not far and DISPLAY_KEY in obj:
+        obj.display_type = obj.pop(DISPLAY_KEY)
+
+
+def _set_bounds(tile, far):
+    for obj in tile.all_objects:
+        _set_object_bounds(obj, far)
+    tile[FAR_KEY] = far
+
+
+def update_tiles(context):
+    """
+    Excludes (or shows as bounds) the tiles farther than the tile radius from
+    the view. Only tiles whose state changes are touched, so the depsgraph
+    is rebuilt just for the tiles that crossed the radius.
+    Returns the number of changed tiles.
+    """
+    scene = context.scene
+    root = bpy.data.collections.get(TILES_NAME)
+    view = get_view_location(context)
+    if root is None or view is None:
+        return 0
+    root_layer = find_layer_collection(context.view_layer.layer_collection, root)
+    if root_layer is None:
+        return 0
+
+    size = root.get(TILE_SIZE_KEY, scene.tile_size)
+    changed = 0
+    for layer in root_layer.children:
+        tile = layer.collection
+        if TILE_KEY not in tile:
+            continue
+
+        # Distance from the view to the nearest point of the tile
+        ix, iy = tile[TILE_KEY]
+        dx = max(ix * size - view.x, 0.0, view.x - (ix + 1) * size)
+        dy = max(iy * size - view.y, 0.0, view.y - (iy + 1) * size)
+        far = math.hypot(dx, dy) > scene.tile_radius
+
+        if scene.tile_mode == 'EXCLUDE':
+            if tile.get(FAR_KEY, False):
+                _set_bounds(tile, False)
+            if layer.exclude != far:
+                layer.exclude = far
+                changed += 1
+        else:
+            if layer.exclude:
+                layer.exclude = False
+            if tile.get(FAR_KEY, False) != far:
+                _set_bounds(tile, far)
+                changed += 1
+    return changed
+
+
+def _stream_tiles():
+    global _last_view
+    context = bpy.context
+    if not context.scene.tile_streaming:
+        _last_view = None
+        return None
+
+    view = get_view_location(context)
+    if view is not None and (_last_view is None or (view - _last_view).length > context.scene.tile_size * 0.25):
+        _last_view = view
+        update_tiles(context)
+    return STREAM_INTERVAL
+
+
+def toggle_streaming(self, context):
+    """Update callback of Scene.tile_streaming."""
+    if context.scene.tile_streaming and not bpy.app.timers.is_registered(_stream_tiles):
+        bpy.app.timers.register(_stream_tiles, first_interval=0.0)
+
+
+def refresh_streaming(self, context):
+    """Update callback of Scene.tile_radius and Scene.tile_mode."""
+    global _last_view
+    # Forget the last view so the next tick re-applies the new settings
+    _last_view = None
+
+
+@persistent
+def resume_streaming(_dummy):
+    """Restarts streaming after loading a file that had it enabled."""
+    toggle_streaming(None, bpy.context)
+
+
+def stop_streaming():
+    if bpy.app.timers.is_registered(_stream_tiles):
+        bpy.app.timers.unregister(_stream_tiles)
+
+
+class ROOTED_OT_BuildTiles(bpy.types.Operator):
+    bl_idname = "rooted.build_tiles"
+    bl_label = "Build Tiles"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Sort all Rooted plants into grid tile collections"
+
+    def execute(self, context):
+        count = build_tiles(context)
+        update_tiles(context)
+
+        self.report({'INFO'}, f"Sorted plants into {count} tile(s)")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+class ROOTED_OT_UpdateTiles(bpy.types.Operator):
+    bl_idname = "rooted.update_tiles"
+    bl_label = "Update Tiles"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Enable the tiles near the view and disable the others"
+
+    def execute(self, context):
+        changed = update_tiles(context)
+
+        self.report({'INFO'}, f"Switched {changed} tile(s)")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+classes = [ROOTED_OT_BuildTiles, ROOTED_OT_UpdateTiles]
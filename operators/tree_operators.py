@@ -37,6 +37,78 @@ SOCKET = {
 }
 
 
+def apply_tree_settings(mod, scene):
+    """
+    Applies the tree preset and season selected in the scene to a generator modifier.
+    """
+    # Apply preset (scale=1.0 for all tree presets)
+    if scene.tree_preset == 'SMALL':
+        mod[SOCKET["scale"]] = 1.0
+
+    elif scene.tree_preset == 'TALL':
+        mod[SOCKET["trunk"]] = 5
+        mod[SOCKET["numLevels"]] = 5
+        mod[SOCKET["bLength"]] = 8
+        mod[SOCKET["rAngle"]] = 0.698
+        mod[SOCKET["thickness"]] = 3.0
+        mod[SOCKET["scale"]] = 1.0
+
+    elif scene.tree_preset == 'THIN':
+        mod[SOCKET["trunk"]] = 2
+        mod[SOCKET["treetop"]] = 5
+        mod[SOCKET["numLevels"]] = 4
+        mod[SOCKET["bLength"]] = 6
+        mod[SOCKET["rAngle"]] = 0.523
+        mod[SOCKET["thickness"]] = 1.8
+        mod[SOCKET["minHeight"]] = 5
+        mod[SOCKET["scale"]] = 1.0
+
+    elif scene.tree_preset == 'DEAD':
+        mod[SOCKET["nBranches"]] = 0  # 0=Two Branches
+        mod[SOCKET["trunk"]] = 1
+        mod[SOCKET["numLevels"]] = 4
+        mod[SOCKET["bLength"]] = 10
+        mod[SOCKET["rAngle"]] = 0.41
+        mod[SOCKET["rJitter"]] = 0.25
+        mod[SOCKET["gravity"]] = 1.7
+        mod[SOCKET["thickness"]] = 1.8
+        mod[SOCKET["addLeaves"]] = False
+        mod[SOCKET["scale"]] = 1.0
+
+    elif scene.tree_preset == 'LARGE':
+        mod[SOCKET["trunk"]] = 2
+        mod[SOCKET["treetop"]] = 2
+        mod[SOCKET["numLevels"]] = 6
+        mod[SOCKET["bLength"]] = 8
+        mod[SOCKET["rAngle"]] = 0.488
+        mod[SOCKET["thickness"]] = 2.9
+        mod[SOCKET["scale"]] = 1.0
+
+    elif scene.tree_preset == 'CUSTOM':
+        mod[SOCKET["trunk"]] = scene.custom_trunk
+        mod[SOCKET["treetop"]] = scene.custom_treetop
+        mod[SOCKET["numLevels"]] = scene.custom_num_levels
+        mod[SOCKET["bLength"]] = scene.custom_branch_length
+        mod[SOCKET["rAngle"]] = scene.custom_branch_angle
+        mod[SOCKET["rJitter"]] = scene.custom_jitter
+        mod[SOCKET["gravity"]] = scene.custom_gravity
+        mod[SOCKET["thickness"]] = scene.custom_thickness
+        mod[SOCKET["minHeight"]] = scene.custom_min_height
+        mod[SOCKET["nBranches"]] = 0 if scene.custom_n_branches == 2 else 1  # 0=Two, 1=Three
+        mod[SOCKET["addLeaves"]] = scene.custom_add_leaves
+        mod[SOCKET["scale"]] = scene.custom_scale
+
+    # Apply season
+    if scene.season == 'SPRING':
+        mod[SOCKET["season"]] = 0.0
+    elif scene.season == 'SUMMER':
+        mod[SOCKET["season"]] = 0.5
+    elif scene.season == 'CUSTOM':
+        mod[SOCKET["season"]] = scene.custom_season_value
+    else:
+        mod[SOCKET["season"]] = 1.0
+
+
 class ROOTED_OT_TreeHideLeaves(bpy.types.Operator):
     bl_idname = "rooted.tree_hide_leaves"
     bl_label = "Hide Leaves"
@@ -119,72 +191,7 @@ class ROOTED_OT_AddTree(bpy.types.Operator):
                 self.report({'ERROR'}, f"Error appending node group: {e}")
                 return {'CANCELLED'}
 
-        # Apply preset (scale=1.0 for all tree presets)
-        if context.scene.tree_preset == 'SMALL':
-            mod[SOCKET["scale"]] = 1.0
-
-        elif context.scene.tree_preset == 'TALL':
-            mod[SOCKET["trunk"]] = 5
-            mod[SOCKET["numLevels"]] = 5
-            mod[SOCKET["bLength"]] = 8
-            mod[SOCKET["rAngle"]] = 0.698
-            mod[SOCKET["thickness"]] = 3.0
-            mod[SOCKET["scale"]] = 1.0
-
-        elif context.scene.tree_preset == 'THIN':
-            mod[SOCKET["trunk"]] = 2
-            mod[SOCKET["treetop"]] = 5
-            mod[SOCKET["numLevels"]] = 4
-            mod[SOCKET["bLength"]] = 6
-            mod[SOCKET["rAngle"]] = 0.523
-            mod[SOCKET["thickness"]] = 1.8
-            mod[SOCKET["minHeight"]] = 5
-            mod[SOCKET["scale"]] = 1.0
-
-        elif context.scene.tree_preset == 'DEAD':
-            mod[SOCKET["nBranches"]] = 0  # 0=Two Branches
-            mod[SOCKET["trunk"]] = 1
-            mod[SOCKET["numLevels"]] = 4
-            mod[SOCKET["bLength"]] = 10
-            mod[SOCKET["rAngle"]] = 0.41
-            mod[SOCKET["rJitter"]] = 0.25
-            mod[SOCKET["gravity"]] = 1.7
-            mod[SOCKET["thickness"]] = 1.8
-            mod[SOCKET["addLeaves"]] = False
-            mod[SOCKET["scale"]] = 1.0
-
-        elif context.scene.tree_preset == 'LARGE':
-            mod[SOCKET["trunk"]] = 2
-            mod[SOCKET["treetop"]] = 2
-            mod[SOCKET["numLevels"]] = 6
-            mod[SOCKET["bLength"]] = 8
-            mod[SOCKET["rAngle"]] = 0.488
-            mod[SOCKET["thickness"]] = 2.9
-            mod[SOCKET["scale"]] = 1.0
-
-        elif context.scene.tree_preset == 'CUSTOM':
-            mod[SOCKET["trunk"]] = context.scene.custom_trunk
-            mod[SOCKET["treetop"]] = context.scene.custom_treetop
-            mod[SOCKET["numLevels"]] = context.scene.custom_num_levels
-            mod[SOCKET["bLength"]] = context.scene.custom_branch_length
-            mod[SOCKET["rAngle"]] = context.scene.custom_branch_angle
-            mod[SOCKET["rJitter"]] = context.scene.custom_jitter
-            mod[SOCKET["gravity"]] = context.scene.custom_gravity
-            mod[SOCKET["thickness"]] = context.scene.custom_thickness
-            mod[SOCKET["minHeight"]] = context.scene.custom_min_height
-            mod[SOCKET["nBranches"]] = 0 if context.scene.custom_n_branches == 2 else 1  # 0=Two, 1=Three
-            mod[SOCKET["addLeaves"]] = context.scene.custom_add_leaves
-            mod[SOCKET["scale"]] = context.scene.custom_scale
-
-        # Apply season
-        if context.scene.season == 'SPRING':
-            mod[SOCKET["season"]] = 0.0
-        elif context.scene.season == 'SUMMER':
-            mod[SOCKET["season"]] = 0.5
-        elif context.scene.season == 'CUSTOM':
-            mod[SOCKET["season"]] = context.scene.custom_season_value
-        else:
-            mod[SOCKET["season"]] = 1.0
+        apply_tree_settings(mod, context.scene)
 
         mod[SOCKET["seed"]] = context.scene.tree_seed
 
@@ -1,4 +1,5 @@
 import bpy
+from .operators.gallery_operators import gallery_items, get_previews
 
 
 class ROOTED_PT_MainPanel(bpy.types.Panel):
@@ -102,4 +103,178 @@ class ROOTED_PT_MainPanel(bpy.types.Panel):
         row.operator("rooted.bush_show_leaves", text="Show Leaves")
 
 
-classes = [ROOTED_PT_MainPanel]
+class ROOTED_PT_GalleryPanel(bpy.types.Panel):
+    bl_label = "Seed Gallery"
+    bl_idname = "ROOTED_PT_gallery_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Rooted"
+    bl_parent_id = "ROOTED_PT_main_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        col = layout.column(align=True)
+        col.prop(scene, "gallery_seed_start")
+        col.prop(scene, "gallery_count")
+        col.prop(scene, "gallery_workers")
+        col.prop(scene, "gallery_samples")
+        col.prop(scene, "gallery_size")
+
+        layout.operator("rooted.render_seed_gallery", text="Render Gallery")
+
+        # Thumbnails appear as the workers finish them, click one to add that seed
+        previews = get_previews()
+        grid = layout.grid_flow(row_major=True, columns=3, even_columns=True, align=True)
+        for seed, key in gallery_items:
+            col = grid.column(align=True)
+            if key in previews:
+                col.template_icon(icon_value=previews[key].icon_id, scale=5.0)
+            else:
+                col.label(text="Rendering...", icon='TIME')
+            col.operator("rooted.pick_gallery_seed", text=f"Seed {seed}").seed = seed
+
+
+class ROOTED_PT_ImpostorPanel(bpy.types.Panel):
+    bl_label = "Impostors"
+    bl_idname = "ROOTED_PT_impostor_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Rooted"
+    bl_parent_id = "ROOTED_PT_main_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        col = layout.column(align=True)
+        col.prop(scene, "impostor_grid")
+        col.prop(scene, "impostor_resolution")
+        col.prop(scene, "impostor_samples")
+
+        layout.operator("rooted.bake_impostors", text="Bake Impostors")
+
+        layout.prop(scene, "impostor_distance", text="Distance")
+        row = layout.row()
+        row.operator("rooted.update_impostor_lod", text="Update LOD")
+        row.operator("rooted.remove_impostors", text="Remove")
+
+
+class ROOTED_PT_LeafCardPanel(bpy.types.Panel):
+    bl_label = "Leaf Cards"
+    bl_idname = "ROOTED_PT_leaf_card_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Rooted"
+    bl_parent_id = "ROOTED_PT_main_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        col = layout.column(align=True)
+        col.prop(scene, "leaf_card_leaves")
+        col.prop(scene, "leaf_card_silhouette")
+        col.prop(scene, "leaf_card_density")
+        col.prop(scene, "leaf_card_resolution")
+        layout.prop(scene, "leaf_card_crossed")
+
+        row = layout.row()
+        row.operator("rooted.build_leaf_cards", text="Build")
+        row.operator("rooted.remove_leaf_cards", text="Remove")
+
+
+class ROOTED_PT_TilePanel(bpy.types.Panel):
+    bl_label = "Tile Streaming"
+    bl_idname = "ROOTED_PT_tile_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Rooted"
+    bl_parent_id = "ROOTED_PT_main_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        layout.prop(scene, "tile_size")
+        layout.operator("rooted.build_tiles", text="Build Tiles")
+
+        layout.prop(scene, "tile_radius")
+        layout.prop(scene, "tile_mode")
+        row = layout.row()
+        row.prop(scene, "tile_streaming", toggle=True)
+        row.operator("rooted.update_tiles", text="Update Now")
+
+        box = layout.box()
+        box.label(text="Merge Baked Plants")
+        row = box.row()
+        row.operator("rooted.merge_plants", text="Merge")
+        row.operator("rooted.split_plants", text="Split")
+
+
+class ROOTED_PT_ExportPanel(bpy.types.Panel):
+    bl_label = "Export"
+    bl_idname = "ROOTED_PT_export_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Rooted"
+    bl_parent_id = "ROOTED_PT_main_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        box = layout.box()
+        box.label(text="Bake")
+        box.prop(scene, "bake_attribute_policy")
+        box.prop(scene, "bake_keep_attributes")
+        box.operator("rooted.bake_plants", text="Bake Selected")
+
+        layout.operator("rooted.export_instanced", text="Export Instanced (glTF/USD)")
+        layout.operator("rooted.export_skeleton", text="Export Skeleton (.npz)")
+
+        box = layout.box()
+        box.label(text="Collision Proxies")
+        box.prop(scene, "proxy_branch_shape")
+        box.prop(scene, "proxy_segments")
+        box.prop(scene, "proxy_foliage_volumes")
+        box.prop(scene, "proxy_foliage_margin")
+        row = box.row()
+        row.operator("rooted.add_collision_proxies", text="Add")
+        row.operator("rooted.remove_collision_proxies", text="Remove")
+
+
+class ROOTED_PT_FingerprintPanel(bpy.types.Panel):
+    bl_label = "Fingerprints"
+    bl_idname = "ROOTED_PT_fingerprint_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Rooted"
+    bl_parent_id = "ROOTED_PT_main_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        obj = context.active_object
+
+        if obj is not None and "rooted_fingerprint" in obj:
+            layout.label(text=f"{obj.name}: {obj['rooted_fingerprint'][:16]}")
+        else:
+            layout.label(text="Active object has no fingerprint")
+
+        row = layout.row()
+        row.operator("rooted.compute_fingerprints", text="Selected").selected_only = True
+        row.operator("rooted.compute_fingerprints", text="All").selected_only = False
+
+        row = layout.row()
+        row.operator("rooted.write_fingerprints", text="Write Reference")
+        row.operator("rooted.compare_fingerprints", text="Compare")
+
+
+classes = [ROOTED_PT_MainPanel, ROOTED_PT_GalleryPanel, ROOTED_PT_ImpostorPanel, ROOTED_PT_LeafCardPanel, ROOTED_PT_TilePanel, ROOTED_PT_ExportPanel, ROOTED_PT_FingerprintPanel]
@@ -0,0 +1,116 @@
+# Rooted - headless seed gallery renderer
+#
+# Run by the add-on as:
+#   blender --background --factory-startup --python gallery_worker.py -- \
+#       <source.blend> <object name> <seed socket> <size> <samples> <seed> <output.png> [<seed> <output.png> ...]
+#
+# Renders one small Cycles CPU thumbnail per seed. Each thumbnail is written
+# to a temporary file and renamed into place, so the add-on never picks up
+# a half-written image.
+
+import bpy
+import os
+import sys
+
+from mathutils import Matrix, Vector
+
+
+def load_source(source, name):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    with bpy.data.libraries.load(source, link=False) as (data_from, data_to):
+        data_to.objects = [name]
+    obj = data_to.objects[0]
+    bpy.context.scene.collection.objects.link(obj)
+    obj.parent = None
+    obj.matrix_world = Matrix.Identity(4)
+    return obj
+
+
+def bounding_sphere(obj):
+    """
+    Returns the center and radius of the evaluated object, leaves included.
+    Object.bound_box of a Geometry Nodes object leaves out its instances,
+    so the corners of every instance the object emits are gathered too.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    corners = []
+    for instance in depsgraph.object_instances:
+        owner = instance.parent if instance.is_instance else instance.object
+        if owner is None or owner.original != obj:
+            continue
+        matrix = instance.matrix_world
+        corners += [matrix @ Vector(corner) for corner in instance.object.bound_box]
+    low = Vector(min(corner[i] for corner in corners) for i in range(3))
+    high = Vector(max(corner[i] for corner in corners) for i in range(3))
+    center = (low + high) / 2.0
+    radius = max((corner - center).length for corner in corners) or 1.0
+    return center, radius
+
+
+def setup_scene(scene, size, samples):
+    scene.render.engine = 'CYCLES'
+    scene.cycles.device = 'CPU'
+    scene.cycles.samples = samples
+    scene.cycles.use_denoising = False
+    scene.render.resolution_x = size
+    scene.render.resolution_y = size
+    scene.render.resolution_percentage = 100
+    scene.render.film_transparent = True
+    scene.render.image_settings.file_format = 'PNG'
+    scene.render.image_settings.color_mode = 'RGBA'
+
+    world = bpy.data.worlds.new("Gallery World")
+    world.use_nodes = True
+    world.node_tree.nodes["Background"].inputs["Color"].default_value = (0.6, 0.65, 0.7, 1.0)
+    scene.world = world
+
+    sun_data = bpy.data.lights.new("Gallery Sun", 'SUN')
+    sun_data.energy = 3.0
+    sun = bpy.data.objects.new("Gallery Sun", sun_data)
+    sun.rotation_euler = (0.8, 0.2, 0.6)
+    scene.collection.objects.link(sun)
+
+    camera_data = bpy.data.cameras.new("Gallery Camera")
+    camera = bpy.data.objects.new("Gallery Camera", camera_data)
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+    return camera
+
+
+def frame_object(camera, obj):
+    """Points the camera at the evaluated bounds of the object from a three-quarter view."""
+    center, radius = bounding_sphere(obj)
+
+    direction = Vector((1.0, -1.0, 0.5)).normalized()
+    distance = radius / 0.42  # half of the default 39.6 degree field of view, plus margin
+    camera.location = center + direction * distance
+    camera.rotation_euler = (-direction).to_track_quat('-Z', 'Y').to_euler()
+    camera.data.clip_start = distance * 0.01
+    camera.data.clip_end = distance + radius * 2.0
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:]
+    source, name, seed_socket = argv[0], argv[1], argv[2]
+    size, samples = int(argv[3]), int(argv[4])
+    jobs = [(int(seed), path) for seed, path in zip(argv[5::2], argv[6::2])]
+
+    obj = load_source(source, name)
+    scene = bpy.context.scene
+    camera = setup_scene(scene, size, samples)
+    mod = next(mod for mod in obj.modifiers if mod.type == 'NODES')
+
+    for seed, path in jobs:
+        mod[seed_socket] = seed
+        obj.update_tag()
+        bpy.context.view_layer.update()
+        frame_object(camera, obj)
+
+        # Saving the result directly avoids the frame number write_still appends
+        bpy.ops.render.render(write_still=False)
+        partial = path + ".part"
+        bpy.data.images["Render Result"].save_render(partial, scene=scene)
+        os.replace(partial, path)
+
+
+main()
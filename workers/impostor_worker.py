@@ -0,0 +1,199 @@
+# Rooted - headless impostor baker
+#
+# Run by the add-on as:
+#   blender --background --factory-startup --python impostor_worker.py -- \
+#       <source.blend> <object name> <output dir> <grid> <resolution> <samples>
+#
+# Renders the object from grid x grid hemi-octahedral directions with Cycles
+# on the CPU and stitches the albedo, normal and depth passes into atlases.
+
+import bpy
+import os
+import sys
+import json
+import shutil
+
+import numpy as np
+from mathutils import Matrix, Vector
+
+
+def hemi_octahedral_direction(i, j, grid):
+    """
+    Returns the view direction for atlas cell (i, j). The card shader uses the
+    inverse of this mapping to pick a cell, so the two must stay in sync.
+    """
+    ex = (i + 0.5) / grid * 2.0 - 1.0
+    ey = (j + 0.5) / grid * 2.0 - 1.0
+    tx = (ex + ey) * 0.5
+    ty = (ex - ey) * 0.5
+    return Vector((tx, ty, 1.0 - abs(tx) - abs(ty))).normalized()
+
+
+def load_source(source, name):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    with bpy.data.libraries.load(source, link=False) as (data_from, data_to):
+        data_to.objects = [name]
+    obj = data_to.objects[0]
+    bpy.context.scene.collection.objects.link(obj)
+    obj.parent = None
+    obj.matrix_world = Matrix.Identity(4)
+    bpy.context.view_layer.update()
+    return obj
+
+
+def bounding_sphere(obj):
+    """
+    Returns the center and radius of the evaluated object, leaves included.
+    Object.bound_box of a Geometry Nodes object leaves out its instances,
+    so the corners of every instance the object emits are gathered too.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    corners = []
+    for instance in depsgraph.object_instances:
+        owner = instance.parent if instance.is_instance else instance.object
+        if owner is None or owner.original != obj:
+            continue
+        matrix = instance.matrix_world
+        corners += [matrix @ Vector(corner) for corner in instance.object.bound_box]
+    low = Vector(min(corner[i] for corner in corners) for i in range(3))
+    high = Vector(max(corner[i] for corner in corners) for i in range(3))
+    center = (low + high) / 2.0
+    radius = max((corner - center).length for corner in corners) or 1.0
+    return center, radius
+
+
+def setup_scene(scene, frames_dir, resolution, samples):
+    scene.render.engine = 'CYCLES'
+    scene.cycles.device = 'CPU'
+    scene.cycles.samples = samples
+    scene.cycles.use_denoising = False
+    scene.render.resolution_x = resolution
+    scene.render.resolution_y = resolution
+    scene.render.resolution_percentage = 100
+    scene.render.film_transparent = True
+    scene.render.use_compositing = True
+
+    view_layer = scene.view_layers[0]
+    view_layer.use_pass_diffuse_color = True
+    view_layer.use_pass_normal = True
+    view_layer.use_pass_z = True
+
+    scene.use_nodes = True
+    tree = scene.node_tree
+    tree.nodes.clear()
+    layers = tree.nodes.new("CompositorNodeRLayers")
+    composite = tree.nodes.new("CompositorNodeComposite")
+    tree.links.new(layers.outputs["Image"], composite.inputs["Image"])
+
+    output = tree.nodes.new("CompositorNodeOutputFile")
+    output.base_path = frames_dir
+    output.format.file_format = 'OPEN_EXR'
+    output.format.color_depth = '32'
+    output.file_slots.clear()
+    for slot, socket in (("albedo_", "DiffCol"), ("normal_", "Normal"), ("depth_", "Depth"), ("alpha_", "Alpha")):
+        output.file_slots.new(slot)
+        tree.links.new(layers.outputs[socket], output.inputs[slot])
+
+
+def load_frame(path, resolution):
+    image = bpy.data.images.load(path)
+    image.colorspace_settings.is_data = True
+    pixels = np.empty(resolution * resolution * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    bpy.data.images.remove(image)
+    return pixels.reshape(resolution, resolution, 4)
+
+
+def save_atlas(path, pixels, float_buffer):
+    height, width = pixels.shape[:2]
+    image = bpy.data.images.new(os.path.basename(path), width, height, alpha=True, float_buffer=float_buffer)
+    image.pixels.foreach_set(pixels.ravel())
+    image.filepath_raw = path
+    image.file_format = 'OPEN_EXR' if float_buffer else 'PNG'
+    image.save()
+    bpy.data.images.remove(image)
+
+
+def linear_to_srgb(color):
+    color = np.clip(color, 0.0, 1.0)
+    return np.where(color <= 0.0031308, color * 12.92, 1.055 * np.power(color, 1.0 / 2.4) - 0.055)
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:]
+    source, name, output_dir = argv[0], argv[1], argv[2]
+    grid, resolution, samples = int(argv[3]), int(argv[4]), int(argv[5])
+
+    obj = load_source(source, name)
+    scene = bpy.context.scene
+
+    # Bounding sphere of the evaluated plant in its local space
+    center, radius = bounding_sphere(obj)
+
+    camera_data = bpy.data.cameras.new("Impostor Camera")
+    camera_data.type = 'ORTHO'
+    camera_data.ortho_scale = radius * 2.0
+    camera_data.clip_start = radius * 0.01
+    camera_data.clip_end = radius * 4.0
+    camera = bpy.data.objects.new("Impostor Camera", camera_data)
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+
+    frames_dir = os.path.join(output_dir, "frames")
+    os.makedirs(frames_dir, exist_ok=True)
+    setup_scene(scene, frames_dir, resolution, samples)
+
+    for j in range(grid):
+        for i in range(grid):
+            direction = hemi_octahedral_direction(i, j, grid)
+            camera.location = center + direction * radius * 2.0
+            camera.rotation_euler = (-direction).to_track_quat('-Z', 'Y').to_euler()
+            # The file output node names its files after the current frame
+            scene.frame_current = j * grid + i
+            bpy.ops.render.render(write_still=False)
+
+    size = grid * resolution
+    albedo = np.zeros((size, size, 4), dtype=np.float32)
+    normal = np.zeros((size, size, 4), dtype=np.float32)
+    depth = np.ones((size, size, 4), dtype=np.float32)
+
+    for j in range(grid):
+        for i in range(grid):
+            frame = j * grid + i
+            rows = slice(j * resolution, (j + 1) * resolution)
+            cols = slice(i * resolution, (i + 1) * resolution)
+
+            def frame_path(slot):
+                return os.path.join(frames_dir, f"{slot}{frame:04d}.exr")
+
+            alpha = load_frame(frame_path("alpha_"), resolution)[..., 0]
+            mask = alpha > 0.0
+
+            albedo[rows, cols, :3] = linear_to_srgb(load_frame(frame_path("albedo_"), resolution)[..., :3])
+            albedo[rows, cols, 3] = alpha
+
+            normal[rows, cols, :3] = load_frame(frame_path("normal_"), resolution)[..., :3] * 0.5 + 0.5
+            normal[rows, cols, 3] = alpha
+
+            # Depth along the view ray, normalized to the bounding sphere
+            z = load_frame(frame_path("depth_"), resolution)[..., 0]
+            depth01 = np.where(mask, np.clip((z - radius) / (radius * 2.0), 0.0, 1.0), 1.0)
+            depth[rows, cols, :3] = depth01[..., None]
+            depth[rows, cols, 3] = alpha
+
+    save_atlas(os.path.join(output_dir, "albedo.png"), albedo, float_buffer=False)
+    save_atlas(os.path.join(output_dir, "normal.png"), normal, float_buffer=False)
+    save_atlas(os.path.join(output_dir, "depth.exr"), depth, float_buffer=True)
+    shutil.rmtree(frames_dir, ignore_errors=True)
+
+    # Written last: its presence marks the cache entry as complete
+    with open(os.path.join(output_dir, "impostor.json"), "w") as f:
+        json.dump({
+            "grid": grid,
+            "resolution": resolution,
+            "center": list(center),
+            "radius": radius,
+        }, f)
+
+
+main()